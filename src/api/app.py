@@ -1,11 +1,37 @@
 """FastAPI application factory."""
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from pathlib import Path
 
 from src.api.routes import router
+from src.api.templating import templates
+
+STATIC_PATH = Path(__file__).parent.parent.parent / "web" / "static"
+
+
+class CachedStaticFiles(StaticFiles):
+    """Static file handler with long-lived browser caching.
+
+    Requests carrying a ``?v=`` version parameter are marked immutable so
+    browsers never re-request them; anything else is revalidated against
+    the ETag/Last-Modified headers StaticFiles already sends.
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if b"v=" in scope.get("query_string", b""):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "no-cache"
+        return response
+
+
+def get_static_version(static_path: Path) -> str:
+    """Version string for static assets, derived from the newest file mtime."""
+    mtimes = [p.stat().st_mtime for p in static_path.rglob("*") if p.is_file()]
+    return str(int(max(mtimes, default=0)))
 
 
 def create_app() -> FastAPI:
@@ -14,12 +40,13 @@ def create_app() -> FastAPI:
         title="Sermon Illustrate",
         description="News feed scanner for sermon illustrations",
         version="0.1.0",
+        default_response_class=ORJSONResponse,
     )
 
     # Mount static files
-    static_path = Path(__file__).parent.parent.parent / "web" / "static"
-    static_path.mkdir(parents=True, exist_ok=True)
-    app.mount("/static", StaticFiles(directory=static_path), name="static")
+    STATIC_PATH.mkdir(parents=True, exist_ok=True)
+    app.mount("/static", CachedStaticFiles(directory=STATIC_PATH), name="static")
+    templates.env.globals["static_version"] = get_static_version(STATIC_PATH)
 
     # Include routes
     app.include_router(router)
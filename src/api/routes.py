@@ -1,18 +1,35 @@
 """Web routes for the dashboard."""
 
 import asyncio
+import hashlib
+import threading
+import orjson
+from dataclasses import asdict
+from datetime import datetime
+from cachetools import LRUCache, TTLCache, cached
+from types import MappingProxyType
+from typing import Optional
 from fastapi import APIRouter, Request, Depends, HTTPException
-from fastapi.responses import RedirectResponse
-from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
-from pathlib import Path
-
-from src.storage.database import get_db, init_db
-from src.storage.models import Source, Article
+from fastapi.responses import HTMLResponse, RedirectResponse, Response, StreamingResponse
+from sqlalchemy import and_, case, delete, func, not_, or_, select, update
+from sqlalchemy.orm import Session, load_only, selectinload
+from anthropic import AsyncAnthropic
+from jinja2 import Environment
+
+try:
+    from openai import AsyncOpenAI
+except ImportError:  # OpenAI is optional; Anthropic is used without it
+    AsyncOpenAI = None
+
+from src.api.schemas import AddSourceIn, FinishIllustrationIn, ToggleSourceIn
+from src.api.templating import templates
+from src.storage.database import SessionLocal, get_db, init_db
+from src.storage.models import Source, Article, Theme, article_themes, articles_to_dicts
 from src.feeds.fetcher import refresh_feeds
 from src.feeds.loader import init_data
 from src.processors.analyzer import analyze_batch
-from src.processors.search import search_illustrations, SearchResult
+from src.processors.search import iter_search_illustrations, search_illustrations, SearchResult
+from src.integrations.llm import get_anthropic_key, get_async_anthropic_client, get_async_openai_client
 from src.integrations.twitter import (
     get_twitter_config,
     TwitterAuth,
@@ -22,8 +39,6 @@ from src.integrations.twitter import (
 
 router = APIRouter()
 
-templates = Jinja2Templates(directory=Path(__file__).parent.parent.parent / "web" / "templates")
-
 # Sample data for when database is empty
 SAMPLE_ARTICLES = [
     {
@@ -64,42 +79,164 @@ SAMPLE_ARTICLES = [
     },
 ]
 
-CATEGORIES = [
-    {"id": "all", "name": "All Stories", "icon": "home", "color": "#6366f1"},
-    {"id": "general", "name": "General", "icon": "newspaper", "color": "#8b5cf6"},
-    {"id": "politics", "name": "Politics", "icon": "landmark", "color": "#ec4899"},
-    {"id": "economics", "name": "Economics", "icon": "trending-up", "color": "#f59e0b"},
-    {"id": "technology", "name": "Technology", "icon": "cpu", "color": "#10b981"},
-    {"id": "science", "name": "Science", "icon": "flask-conical", "color": "#06b6d4"},
-    {"id": "psychology", "name": "Psychology", "icon": "brain", "color": "#f97316"},
-    {"id": "medicine", "name": "Medicine", "icon": "heart-pulse", "color": "#ef4444"},
-    {"id": "culture", "name": "Culture", "icon": "palette", "color": "#a855f7"},
-]
+CATEGORIES = (
+    MappingProxyType({"id": "all", "name": "All Stories", "icon": "home", "color": "#6366f1"}),
+    MappingProxyType({"id": "general", "name": "General", "icon": "newspaper", "color": "#8b5cf6"}),
+    MappingProxyType({"id": "politics", "name": "Politics", "icon": "landmark", "color": "#ec4899"}),
+    MappingProxyType({"id": "economics", "name": "Economics", "icon": "trending-up", "color": "#f59e0b"}),
+    MappingProxyType({"id": "technology", "name": "Technology", "icon": "cpu", "color": "#10b981"}),
+    MappingProxyType({"id": "science", "name": "Science", "icon": "flask-conical", "color": "#06b6d4"}),
+    MappingProxyType({"id": "psychology", "name": "Psychology", "icon": "brain", "color": "#f97316"}),
+    MappingProxyType({"id": "medicine", "name": "Medicine", "icon": "heart-pulse", "color": "#ef4444"}),
+    MappingProxyType({"id": "culture", "name": "Culture", "icon": "palette", "color": "#a855f7"}),
+)
 
-CATEGORY_COLORS = {cat["id"]: cat["color"] for cat in CATEGORIES}
+CATEGORY_COLORS = MappingProxyType({cat["id"]: cat["color"] for cat in CATEGORIES})
+CATEGORY_NAMES = MappingProxyType({cat["id"]: cat["name"] for cat in CATEGORIES})
+
+# Every page renders the sidebar from these, so expose them to all templates
+templates.env.globals.update(categories=CATEGORIES, category_colors=CATEGORY_COLORS)
+
+# Sample articles grouped by category, built once for the empty-database fallback
+SAMPLE_BY_CATEGORY = MappingProxyType({
+    category: [a for a in SAMPLE_ARTICLES if a["category"] == category]
+    for category in {a["category"] for a in SAMPLE_ARTICLES}
+})
+
+
+# Only the columns Article.to_dict() reads, so list pages skip the full
+# article content and other unused fields
+ARTICLE_CARD_COLUMNS = load_only(
+    Article.id,
+    Article.source_name,
+    Article.category,
+    Article.title,
+    Article.url,
+    Article.summary,
+    Article.ai_summary,
+    Article.published_at,
+    Article.illustration_score,
+    Article.bookmarked,
+    Article.notes,
+)
+ARTICLE_CARD_THEMES = selectinload(Article.themes).load_only(Theme.name)
 
 
 def get_articles(db: Session, category: str = None, limit: int = 50) -> list[dict]:
     """Get articles from database, falling back to sample data."""
-    query = db.query(Article).order_by(Article.published_at.desc().nullslast())
+    query = (
+        db.query(Article)
+        .options(ARTICLE_CARD_COLUMNS, ARTICLE_CARD_THEMES)
+        .order_by(Article.published_at.desc().nullslast())
+    )
 
     if category and category != "all":
-        query = query.join(Source).filter(Source.category == category)
+        query = query.filter(Article.category == category)
 
     articles = query.limit(limit).all()
 
     if not articles:
         # Return sample data if database is empty
         if category and category != "all":
-            return [a for a in SAMPLE_ARTICLES if a["category"] == category]
+            return SAMPLE_BY_CATEGORY.get(category, [])
         return SAMPLE_ARTICLES
 
-    return [article.to_dict() for article in articles]
+    return articles_to_dicts(articles)
+
+
+# Dashboard stats and page ETags barely change between requests, so keep
+# them for a few seconds. Rendered pages are kept by ETag. Handlers that
+# write articles or sources clear them and bump the cache generation.
+STATS_CACHE_TTL = 15
+ETAG_CACHE_TTL = 5
+stats_cache = TTLCache(maxsize=1, ttl=STATS_CACHE_TTL)
+etag_cache = TTLCache(maxsize=1, ttl=ETAG_CACHE_TTL)
+page_cache = LRUCache(maxsize=32)
+cache_lock = threading.Lock()
+cache_generation = 0
+
+
+def clear_dashboard_caches():
+    """Drop cached stats, ETags and pages so the next request recomputes them."""
+    global cache_generation
+    with cache_lock:
+        cache_generation += 1
+        stats_cache.clear()
+        etag_cache.clear()
+        page_cache.clear()
+
+
+@cached(etag_cache, key=lambda db: "version", lock=cache_lock)
+def get_content_version(db: Session) -> str:
+    """Fingerprint of everything the dashboard pages render from the database."""
+    enabled_sources = (
+        db.query(func.count(Source.id)).filter(Source.enabled == True).scalar_subquery()
+    )
+    row = db.query(
+        func.max(Article.fetched_at),
+        func.max(Article.analyzed_at),
+        func.count(Article.id),
+        func.sum(case((Article.bookmarked == True, 1), else_=0)),
+        enabled_sources,
+    ).one()
+
+    return hashlib.blake2b(repr(tuple(row)).encode(), digest_size=16).hexdigest()
+
+
+def get_page_etag(db: Session, request: Request) -> str:
+    """ETag for a dashboard page.
+
+    Includes the current minute so relative "published" times stay fresh.
+    """
+    minute = datetime.utcnow().strftime("%Y%m%d%H%M")
+    page = f"{request.url.path}?{request.url.query}"
+    key = f"{get_content_version(db)}:{cache_generation}:{page}:{minute}"
+    return '"' + hashlib.blake2b(key.encode(), digest_size=16).hexdigest() + '"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Check whether the client's If-None-Match already holds this ETag."""
+    if_none_match = request.headers.get("if-none-match", "")
+    return etag in [tag.strip() for tag in if_none_match.split(",")]
+
 
+def render_cached_page(request: Request, etag: str, name: str, build_context) -> HTMLResponse:
+    """Render a template once per ETag and serve the stored HTML afterwards.
 
+    Args:
+        request: Incoming request
+        etag: Page ETag, used as the cache key
+        name: Template name
+        build_context: Callable returning the template context on a cache miss
+
+    Returns:
+        HTMLResponse carrying the ETag
+    """
+    with cache_lock:
+        body = page_cache.get(etag)
+
+    if body is None:
+        context = build_context()
+        context["request"] = request
+        body = templates.get_template(name).render(context).encode()
+        with cache_lock:
+            page_cache[etag] = body
+
+    return HTMLResponse(body, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+@cached(stats_cache, key=lambda db: "stats", lock=cache_lock)
 def get_stats(db: Session) -> dict:
-    """Get dashboard statistics."""
-    article_count = db.query(Article).count()
+    """Get dashboard statistics (cached for STATS_CACHE_TTL seconds)."""
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    # All article counts in a single aggregate query
+    article_count, articles_today, high_potential, bookmarked = db.query(
+        func.count(Article.id),
+        func.sum(case((Article.fetched_at >= today, 1), else_=0)),
+        func.sum(case((Article.illustration_score >= 85, 1), else_=0)),
+        func.sum(case((Article.bookmarked == True, 1), else_=0)),
+    ).one()
 
     if article_count == 0:
         # Return sample stats
@@ -110,76 +247,120 @@ def get_stats(db: Session) -> dict:
             "sources": 12,
         }
 
-    from datetime import datetime, timedelta
-    from sqlalchemy import func
-
-    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-
     return {
-        "articles_today": db.query(Article).filter(Article.fetched_at >= today).count(),
-        "high_potential": db.query(Article).filter(Article.illustration_score >= 85).count(),
-        "bookmarked": db.query(Article).filter(Article.bookmarked == True).count(),
+        "articles_today": articles_today or 0,
+        "high_potential": high_potential or 0,
+        "bookmarked": bookmarked or 0,
         "sources": db.query(Source).filter(Source.enabled == True).count(),
     }
 
 
 @router.get("/")
-async def dashboard(request: Request, db: Session = Depends(get_db)):
+def dashboard(request: Request, db: Session = Depends(get_db)):
     """Main dashboard page."""
-    articles = get_articles(db)
-    stats = get_stats(db)
+    etag = get_page_etag(db, request)
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
 
-    return templates.TemplateResponse(
+    return render_cached_page(
+        request,
+        etag,
         "dashboard.html",
-        {
-            "request": request,
-            "articles": articles,
-            "categories": CATEGORIES,
-            "category_colors": CATEGORY_COLORS,
+        lambda: {
+            "articles": get_articles(db),
             "active_category": "all",
             "page_title": "Dashboard",
-            "stats": stats,
+            "stats": get_stats(db),
         },
     )
 
 
 @router.get("/category/{category_id}")
-async def category_view(request: Request, category_id: str, db: Session = Depends(get_db)):
+def category_view(request: Request, category_id: str, db: Session = Depends(get_db)):
     """Category filtered view."""
-    articles = get_articles(db, category=category_id)
-    stats = get_stats(db)
-    category_name = next((c["name"] for c in CATEGORIES if c["id"] == category_id), "All Stories")
+    etag = get_page_etag(db, request)
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
 
-    return templates.TemplateResponse(
+    return render_cached_page(
+        request,
+        etag,
         "dashboard.html",
-        {
-            "request": request,
-            "articles": articles,
-            "categories": CATEGORIES,
-            "category_colors": CATEGORY_COLORS,
+        lambda: {
+            "articles": get_articles(db, category=category_id),
             "active_category": category_id,
-            "page_title": category_name,
-            "stats": stats,
+            "page_title": CATEGORY_NAMES.get(category_id, "All Stories"),
+            "stats": get_stats(db),
         },
     )
 
 
+BOOKMARKS_PAGE_SIZE = 50
+
+
+def encode_bookmark_cursor(article: Article) -> str:
+    """Encode an article's sort position as a bookmarks page cursor."""
+    published = article.published_at.isoformat() if article.published_at else ""
+    return f"{published}|{article.id}"
+
+
+def decode_bookmark_cursor(cursor: str) -> tuple[Optional[datetime], int]:
+    """Decode a bookmarks cursor into (published_at, article_id)."""
+    try:
+        published, article_id = cursor.rsplit("|", 1)
+        return (datetime.fromisoformat(published) if published else None), int(article_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/bookmarks")
-async def bookmarks(request: Request, db: Session = Depends(get_db)):
-    """Bookmarked articles page."""
-    articles = db.query(Article).filter(Article.bookmarked == True).order_by(Article.published_at.desc()).all()
-    article_dicts = [a.to_dict() for a in articles]
+def bookmarks(request: Request, cursor: Optional[str] = None, db: Session = Depends(get_db)):
+    """Bookmarked articles page, newest first, paged with a keyset cursor."""
+    etag = get_page_etag(db, request)
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    query = (
+        db.query(Article)
+        .options(ARTICLE_CARD_COLUMNS, ARTICLE_CARD_THEMES)
+        .filter(Article.bookmarked == True)
+        .order_by(Article.published_at.desc().nullslast(), Article.id.desc())
+    )
 
-    return templates.TemplateResponse(
-        "bookmarks.html",
-        {
-            "request": request,
-            "articles": article_dicts,
-            "categories": CATEGORIES,
-            "category_colors": CATEGORY_COLORS,
-            "active_category": None,
-            "page_title": "Bookmarks",
-        },
+    # Continue after the last article of the previous page
+    if cursor:
+        published_at, article_id = decode_bookmark_cursor(cursor)
+        if published_at is None:
+            query = query.filter(Article.published_at == None, Article.id < article_id)
+        else:
+            query = query.filter(
+                or_(
+                    Article.published_at < published_at,
+                    and_(Article.published_at == published_at, Article.id < article_id),
+                    Article.published_at == None,
+                )
+            )
+
+    # Fetch one extra row to learn whether there is a next page
+    articles = query.limit(BOOKMARKS_PAGE_SIZE + 1).all()
+    next_cursor = None
+    if len(articles) > BOOKMARKS_PAGE_SIZE:
+        articles = articles[:BOOKMARKS_PAGE_SIZE]
+        next_cursor = encode_bookmark_cursor(articles[-1])
+
+    context = {
+        "request": request,
+        "articles": articles_to_dicts(articles),
+        "next_cursor": next_cursor,
+        "active_category": None,
+        "page_title": "Bookmarks",
+    }
+
+    # Stream the page so the first bytes go out before rendering finishes
+    return StreamingResponse(
+        templates.get_template("bookmarks.html").generate(context),
+        media_type="text/html",
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
     )
 
 
@@ -190,8 +371,6 @@ async def digest(request: Request):
         "digest.html",
         {
             "request": request,
-            "categories": CATEGORIES,
-            "category_colors": CATEGORY_COLORS,
             "active_category": None,
             "page_title": "Daily Digest",
         },
@@ -199,7 +378,7 @@ async def digest(request: Request):
 
 
 @router.get("/settings")
-async def settings(request: Request, db: Session = Depends(get_db)):
+def settings(request: Request, db: Session = Depends(get_db)):
     """Settings page."""
     # Get all sources sorted by category then name
     all_sources = db.query(Source).order_by(Source.category, Source.name).all()
@@ -208,8 +387,6 @@ async def settings(request: Request, db: Session = Depends(get_db)):
         "settings.html",
         {
             "request": request,
-            "categories": CATEGORIES,
-            "category_colors": CATEGORY_COLORS,
             "active_category": None,
             "page_title": "Settings",
             "all_sources": all_sources,
@@ -223,54 +400,69 @@ async def settings(request: Request, db: Session = Depends(get_db)):
 async def api_refresh_feeds(db: Session = Depends(get_db)):
     """Refresh all feeds."""
     result = await refresh_feeds(db)
+    clear_dashboard_caches()
     return result
 
 
 @router.post("/api/init")
-async def api_init_db(db: Session = Depends(get_db)):
+def api_init_db(db: Session = Depends(get_db)):
     """Initialize database with sources and themes."""
     init_db()
     result = init_data(db)
+    clear_dashboard_caches()
     return result
 
 
 @router.post("/api/bookmark/{article_id}")
-async def api_toggle_bookmark(article_id: int, db: Session = Depends(get_db)):
+def api_toggle_bookmark(article_id: int, db: Session = Depends(get_db)):
     """Toggle bookmark status for an article."""
-    article = db.query(Article).filter(Article.id == article_id).first()
-    if not article:
+    # Flip the flag in one UPDATE ... RETURNING round trip
+    bookmarked = db.execute(
+        update(Article)
+        .where(Article.id == article_id)
+        .values(bookmarked=not_(func.coalesce(Article.bookmarked, False)))
+        .returning(Article.bookmarked)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    if bookmarked is None:
         raise HTTPException(status_code=404, detail="Article not found")
 
-    article.bookmarked = not article.bookmarked
     db.commit()
+    clear_dashboard_caches()
 
-    return {"bookmarked": article.bookmarked}
+    return {"bookmarked": bookmarked}
 
 
 @router.post("/api/analyze")
-async def api_analyze_articles(db: Session = Depends(get_db), limit: int = 10):
+def api_analyze_articles(
+    db: Session = Depends(get_db),
+    limit: int = 10,
+    api_key: Optional[str] = Depends(get_anthropic_key),
+):
     """Analyze unanalyzed articles with AI."""
-    import os
-
-    api_key = os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
         raise HTTPException(status_code=500, detail="ANTHROPIC_API_KEY not configured")
 
     result = analyze_batch(db, limit=limit, api_key=api_key)
+    clear_dashboard_caches()
     return result
 
 
 # Search routes
 
 @router.get("/search")
-async def search_page(request: Request, q: str = "", category: str = "all", db: Session = Depends(get_db)):
+def search_page(
+    request: Request,
+    q: str = "",
+    category: str = "all",
+    db: Session = Depends(get_db),
+    api_key: Optional[str] = Depends(get_anthropic_key),
+):
     """Sermon search page."""
     results = []
     error = None
 
     if q:
-        import os
-        api_key = os.getenv("ANTHROPIC_API_KEY")
         if not api_key:
             error = "ANTHROPIC_API_KEY not configured"
         else:
@@ -305,8 +497,6 @@ async def search_page(request: Request, q: str = "", category: str = "all", db:
             "query": q,
             "results": results,
             "error": error,
-            "categories": CATEGORIES,
-            "category_colors": CATEGORY_COLORS,
             "selected_category": category,
             "active_category": None,
             "page_title": "Sermon Search",
@@ -315,11 +505,13 @@ async def search_page(request: Request, q: str = "", category: str = "all", db:
 
 
 @router.post("/api/search")
-async def api_search(query: str, db: Session = Depends(get_db), limit: int = 10):
+def api_search(
+    query: str,
+    db: Session = Depends(get_db),
+    limit: int = 10,
+    api_key: Optional[str] = Depends(get_anthropic_key),
+):
     """API endpoint for sermon search."""
-    import os
-
-    api_key = os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
         raise HTTPException(status_code=500, detail="ANTHROPIC_API_KEY not configured")
 
@@ -346,35 +538,35 @@ async def api_search(query: str, db: Session = Depends(get_db), limit: int = 10)
     }
 
 
-@router.post("/api/finish-illustration")
-async def api_finish_illustration(request: Request, db: Session = Depends(get_db)):
-    """Generate a sermon-ready illustration paragraph."""
-    import os
-    from openai import OpenAI
-    from anthropic import Anthropic
-
-    data = await request.json()
-    article_id = data.get("article_id")
-    title = data.get("title", "")
-    connection = data.get("connection", "")
-    sermon_topic = data.get("sermon_topic", "")
+@router.get("/api/search/stream")
+def api_search_stream(
+    query: str,
+    limit: int = 10,
+    api_key: Optional[str] = Depends(get_anthropic_key),
+):
+    """Sermon search streamed as NDJSON, one result per line as it is ranked."""
+    if not api_key:
+        raise HTTPException(status_code=500, detail="ANTHROPIC_API_KEY not configured")
 
-    openai_key = os.getenv("OPENAI_API_KEY")
-    anthropic_key = os.getenv("ANTHROPIC_API_KEY")
+    def generate():
+        # The request's session is closed before the body streams, so use our own
+        db = SessionLocal()
+        try:
+            for result in iter_search_illustrations(db, query, limit=limit, api_key=api_key):
+                yield orjson.dumps(asdict(result)) + b"\n"
+        finally:
+            db.close()
 
-    if not openai_key and not anthropic_key:
-        raise HTTPException(status_code=500, detail="No API key configured")
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
-    # Get article details
-    article = db.query(Article).filter(Article.id == article_id).first()
-    summary = article.ai_summary or article.summary if article else ""
 
-    prompt = f"""Write a sermon-ready illustration paragraph based on this news story.
+# Plain-text prompt, compiled once at import (no HTML autoescaping)
+ILLUSTRATION_TEMPLATE = Environment(autoescape=False).from_string("""Write a sermon-ready illustration paragraph based on this news story.
 
-Sermon Topic: {sermon_topic}
-Story: {title}
-Summary: {summary}
-Connection: {connection}
+Sermon Topic: {{ sermon_topic }}
+Story: {{ title }}
+Summary: {{ summary }}
+Connection: {{ connection }}
 
 Write a single paragraph (3-5 sentences) that a pastor could read directly in a sermon.
 - Start with a compelling hook
@@ -383,20 +575,41 @@ Write a single paragraph (3-5 sentences) that a pastor could read directly in a
 - Keep it conversational and engaging
 - Do NOT include phrases like "This story illustrates..." - just tell it naturally
 
-Only return the paragraph, nothing else."""
+Only return the paragraph, nothing else.""")
+
+
+@router.post("/api/finish-illustration")
+async def api_finish_illustration(
+    payload: FinishIllustrationIn,
+    db: Session = Depends(get_db),
+    openai_client: Optional[AsyncOpenAI] = Depends(get_async_openai_client),
+    anthropic_client: Optional[AsyncAnthropic] = Depends(get_async_anthropic_client),
+):
+    """Generate a sermon-ready illustration paragraph."""
+    if not openai_client and not anthropic_client:
+        raise HTTPException(status_code=500, detail="No API key configured")
+
+    # Get article details
+    article = db.query(Article).filter(Article.id == payload.article_id).first()
+    summary = article.ai_summary or article.summary if article else ""
+
+    prompt = ILLUSTRATION_TEMPLATE.render(
+        sermon_topic=payload.sermon_topic,
+        title=payload.title,
+        summary=summary,
+        connection=payload.connection,
+    )
 
     # Use GPT-4o-mini for speed (falls back to Haiku)
-    if openai_key:
-        client = OpenAI(api_key=openai_key)
-        response = client.chat.completions.create(
+    if openai_client:
+        response = await openai_client.chat.completions.create(
             model="gpt-4o-mini",
             max_tokens=300,
             messages=[{"role": "user", "content": prompt}],
         )
         illustration = response.choices[0].message.content.strip()
     else:
-        client = Anthropic(api_key=anthropic_key)
-        response = client.messages.create(
+        response = await anthropic_client.messages.create(
             model="claude-3-5-haiku-20241022",
             max_tokens=300,
             messages=[{"role": "user", "content": prompt}],
@@ -409,55 +622,50 @@ Only return the paragraph, nothing else."""
 # Source management endpoints
 
 @router.post("/api/sources/{source_id}/toggle")
-async def api_toggle_source(source_id: int, request: Request, db: Session = Depends(get_db)):
+def api_toggle_source(source_id: int, payload: ToggleSourceIn, db: Session = Depends(get_db)):
     """Toggle a source's enabled status."""
-    data = await request.json()
-    enabled = data.get("enabled", True)
-
     source = db.query(Source).filter(Source.id == source_id).first()
     if not source:
         raise HTTPException(status_code=404, detail="Source not found")
 
-    source.enabled = enabled
+    source.enabled = payload.enabled
     db.commit()
+    clear_dashboard_caches()
 
     return {"success": True, "enabled": source.enabled}
 
 
 @router.delete("/api/sources/{source_id}")
-async def api_delete_source(source_id: int, db: Session = Depends(get_db)):
+def api_delete_source(source_id: int, db: Session = Depends(get_db)):
     """Delete a source and all its articles."""
     source = db.query(Source).filter(Source.id == source_id).first()
     if not source:
         raise HTTPException(status_code=404, detail="Source not found")
 
-    # Delete all articles from this source
-    db.query(Article).filter(Article.source_id == source_id).delete()
+    # Delete theme links and articles in bulk without syncing the session.
+    # ON DELETE CASCADE covers this on PostgreSQL; SQLite doesn't enforce it.
+    source_articles = select(Article.id).where(Article.source_id == source_id)
+    db.execute(delete(article_themes).where(article_themes.c.article_id.in_(source_articles)))
+    db.query(Article).filter(Article.source_id == source_id).delete(synchronize_session=False)
     db.delete(source)
     db.commit()
+    clear_dashboard_caches()
 
     return {"success": True}
 
 
 @router.post("/api/sources")
-async def api_add_source(request: Request, db: Session = Depends(get_db)):
+def api_add_source(payload: AddSourceIn, db: Session = Depends(get_db)):
     """Add a new feed source."""
-    data = await request.json()
-    name = data.get("name", "").strip()
-    url = data.get("url", "").strip()
-    category = data.get("category", "general")
-
-    if not name or not url:
-        raise HTTPException(status_code=400, detail="Name and URL are required")
-
     # Check if source already exists
-    existing = db.query(Source).filter(Source.url == url).first()
+    existing = db.query(Source).filter(Source.url == payload.url).first()
     if existing:
         raise HTTPException(status_code=400, detail="Source with this URL already exists")
 
-    source = Source(name=name, url=url, category=category, enabled=True)
+    source = Source(name=payload.name, url=payload.url, category=payload.category, enabled=True)
     db.add(source)
     db.commit()
+    clear_dashboard_caches()
 
     return {"success": True, "id": source.id}
 
@@ -465,18 +673,24 @@ async def api_add_source(request: Request, db: Session = Depends(get_db)):
 # Twitter integration endpoints
 
 @router.get("/auth/twitter")
-async def twitter_auth_start():
+def twitter_auth_start(db: Session = Depends(get_db)):
     """Start Twitter OAuth flow."""
     config = get_twitter_config()
     if not config:
         raise HTTPException(status_code=500, detail="Twitter not configured. Add TWITTER_CLIENT_ID and TWITTER_CLIENT_SECRET to .env")
 
-    auth_url, state = TwitterAuth.start_auth(config)
+    auth_url, state = TwitterAuth.start_auth(db, config)
     return RedirectResponse(url=auth_url)
 
 
 @router.get("/auth/twitter/callback")
-async def twitter_auth_callback(request: Request, code: str = None, state: str = None, error: str = None):
+def twitter_auth_callback(
+    request: Request,
+    code: str = None,
+    state: str = None,
+    error: str = None,
+    db: Session = Depends(get_db),
+):
     """Handle Twitter OAuth callback."""
     if error:
         return RedirectResponse(url="/settings?twitter_error=" + error)
@@ -484,27 +698,31 @@ async def twitter_auth_callback(request: Request, code: str = None, state: str =
     if not code or not state:
         return RedirectResponse(url="/settings?twitter_error=missing_params")
 
-    token = TwitterAuth.complete_auth(state, code)
+    config = get_twitter_config()
+    if not config:
+        return RedirectResponse(url="/settings?twitter_error=not_configured")
+
+    token = TwitterAuth.complete_auth(db, config, state, code)
     if not token:
         return RedirectResponse(url="/settings?twitter_error=auth_failed")
 
     # Store token (using "default" as user ID for single-user setup)
-    TwitterAuth.store_token("default", token)
+    TwitterAuth.store_token(db, "default", token)
 
     return RedirectResponse(url="/settings?twitter_success=true")
 
 
 @router.post("/api/twitter/disconnect")
-async def twitter_disconnect():
+def twitter_disconnect(db: Session = Depends(get_db)):
     """Disconnect Twitter account."""
-    TwitterAuth.remove_token("default")
+    TwitterAuth.remove_token(db, "default")
     return {"success": True}
 
 
 @router.get("/api/twitter/search")
-async def twitter_search(q: str, limit: int = 20):
+def twitter_search(q: str, limit: int = 20, db: Session = Depends(get_db)):
     """Search Twitter for tweets."""
-    token = TwitterAuth.get_token("default")
+    token = TwitterAuth.get_token(db, "default")
     if not token:
         raise HTTPException(status_code=401, detail="Twitter not connected")
 
@@ -515,10 +733,10 @@ async def twitter_search(q: str, limit: int = 20):
 
 
 @router.get("/api/twitter/status")
-async def twitter_status():
+def twitter_status(db: Session = Depends(get_db)):
     """Check if Twitter is connected."""
     config = get_twitter_config()
-    token = TwitterAuth.get_token("default")
+    token = TwitterAuth.get_token(db, "default")
 
     return {
         "configured": config is not None,
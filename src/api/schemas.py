@@ -0,0 +1,30 @@
+"""Request bodies for the JSON API endpoints."""
+
+from typing import Annotated, Optional
+
+from pydantic import BaseModel, StringConstraints
+
+NonEmptyStr = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+
+
+class ToggleSourceIn(BaseModel):
+    """Body for enabling or disabling a source."""
+
+    enabled: bool = True
+
+
+class AddSourceIn(BaseModel):
+    """Body for adding a new feed source."""
+
+    name: NonEmptyStr
+    url: NonEmptyStr
+    category: str = "general"
+
+
+class FinishIllustrationIn(BaseModel):
+    """Body for generating a sermon-ready illustration."""
+
+    article_id: Optional[int] = None
+    title: str = ""
+    connection: str = ""
+    sermon_topic: str = ""
@@ -0,0 +1,21 @@
+"""Shared Jinja2 templates for the web dashboard."""
+
+import os
+from pathlib import Path
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+
+TEMPLATES_PATH = Path(__file__).parent.parent.parent / "web" / "templates"
+
+# Compile each template once and keep it for the life of the process.
+# Set TEMPLATE_AUTO_RELOAD=true in development to pick up edits without a restart.
+template_env = Environment(
+    loader=FileSystemLoader(TEMPLATES_PATH),
+    autoescape=True,
+    auto_reload=os.getenv("TEMPLATE_AUTO_RELOAD", "false").lower() == "true",
+    cache_size=-1,
+    bytecode_cache=FileSystemBytecodeCache(),
+)
+
+templates = Jinja2Templates(env=template_env)
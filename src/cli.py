@@ -10,15 +10,35 @@ from pathlib import Path
 from dotenv import load_dotenv
 load_dotenv(Path(__file__).parent.parent / ".env")
 
+from sqlalchemy import select
+from sqlalchemy.orm import lazyload, load_only, selectinload
+
 from src.storage.database import init_db, SessionLocal
-from src.storage.models import Source, Article
-from src.feeds.loader import init_data, load_sources_from_yaml
-from src.feeds.fetcher import refresh_feeds, FeedFetcher, save_articles
-from src.processors.analyzer import analyze_batch, ArticleAnalyzer, analyze_and_save
+from src.storage.models import Source, Article, Theme
+
+# Feed, HTTP and LLM modules are imported inside the commands that use them,
+# so listing commands and --help start quickly
+
+# Rows fetched per round trip when streaming article listings
+CLI_BATCH_SIZE = 50
+
+# Articles embedded per write of the search index when reindexing
+REINDEX_BATCH_SIZE = 256
+
+# Row formatters for the article listings, built once
+_ARTICLE_ROW = "{title:<50} {source:<15} {score:<6} {published:<15}".format
+_TOP_ROW = "{score:<6} {title:<55} {themes:<25}".format
+
+
+def _trunc(text: str, width: int) -> str:
+    """Shorten text to width characters, marking the cut with '..'."""
+    return text if len(text) <= width else text[: width - 2] + ".."
 
 
 def cmd_init(args):
     """Initialize database and load default data."""
+    from src.feeds.loader import init_data
+
     print("Initializing database...")
     init_db()
 
@@ -58,6 +78,8 @@ def cmd_sources(args):
 
 def cmd_fetch(args):
     """Fetch all enabled feeds."""
+    from src.feeds.fetcher import refresh_feeds
+
     print("Fetching feeds...")
 
     db = SessionLocal()
@@ -67,6 +89,7 @@ def cmd_fetch(args):
         print(f"\nResults:")
         print(f"  Sources fetched: {result['sources_fetched']}")
         print(f"  Sources failed: {result['sources_failed']}")
+        print(f"  Sources unchanged: {result['sources_not_modified']}")
         print(f"  New articles: {result['articles_new']}")
         print(f"  Updated articles: {result['articles_updated']}")
 
@@ -80,9 +103,13 @@ def cmd_fetch(args):
 
 def cmd_fetch_one(args):
     """Fetch a single source by name."""
+    from src.feeds.fetcher import FeedFetcher, save_articles
+
     db = SessionLocal()
     try:
-        source = db.query(Source).filter(Source.name.ilike(f"%{args.name}%")).first()
+        source = db.scalars(
+            select(Source).where(Source.name.ilike(f"%{args.name}%")).limit(1)
+        ).first()
 
         if not source:
             print(f"Source not found: {args.name}")
@@ -90,13 +117,23 @@ def cmd_fetch_one(args):
 
         print(f"Fetching: {source.name} ({source.url})...")
 
-        fetcher = FeedFetcher()
-        articles, error = asyncio.run(fetcher.fetch_and_parse(source))
+        async def fetch_source():
+            async with FeedFetcher() as fetcher:
+                return await fetcher.fetch_and_parse(source)
+
+        articles, error = asyncio.run(fetch_source())
 
         if error:
             print(f"Error: {error}")
             return
 
+        if articles is None:
+            source.last_fetched = datetime.utcnow()
+            source.fetch_error = None
+            db.commit()
+            print("Not modified since last fetch.")
+            return
+
         new_count, updated_count = save_articles(db, source, articles)
         print(f"Done! New: {new_count}, Updated: {updated_count}")
 
@@ -115,28 +152,34 @@ def cmd_articles(args):
         query = db.query(Article).order_by(Article.published_at.desc())
 
         if args.category:
-            query = query.join(Source).filter(Source.category == args.category)
+            query = query.filter(Article.category == args.category)
 
         if args.bookmarked:
             query = query.filter(Article.bookmarked == True)
 
-        articles = query.limit(args.limit).all()
-
-        if not articles:
+        # Stream rows in batches and print as they arrive
+        shown = 0
+        now = datetime.utcnow()
+        for article in query.limit(args.limit).yield_per(CLI_BATCH_SIZE):
+            if not shown:
+                print("\n" + _ARTICLE_ROW(title="Title", source="Source", score="Score", published="Published"))
+                print("-" * 90)
+            shown += 1
+
+            print(
+                _ARTICLE_ROW(
+                    title=_trunc(article.title, 50),
+                    source=_trunc(article.source_name or "Unknown", 15),
+                    score=str(int(article.illustration_score)) if article.illustration_score else "-",
+                    published=article._format_published(now),
+                )
+            )
+
+        if not shown:
             print("No articles found.")
             return
 
-        print(f"\n{'Title':<50} {'Source':<15} {'Score':<6} {'Published':<15}")
-        print("-" * 90)
-
-        for article in articles:
-            title = article.title[:48] + ".." if len(article.title) > 50 else article.title
-            source = article.source_name[:13] + ".." if len(article.source_name) > 15 else article.source_name
-            score = str(int(article.illustration_score)) if article.illustration_score else "-"
-            published = article._format_published()
-            print(f"{title:<50} {source:<15} {score:<6} {published:<15}")
-
-        print(f"\nShowing {len(articles)} articles")
+        print(f"\nShowing {shown} articles")
     finally:
         db.close()
 
@@ -145,15 +188,21 @@ def cmd_stats(args):
     """Show database statistics."""
     db = SessionLocal()
     try:
-        source_count = db.query(Source).count()
-        enabled_sources = db.query(Source).filter(Source.enabled == True).count()
-        article_count = db.query(Article).count()
-        bookmarked_count = db.query(Article).filter(Article.bookmarked == True).count()
-        analyzed_count = db.query(Article).filter(Article.illustration_score != None).count()
+        from sqlalchemy import case, func
+
+        # Source and article counts, one aggregate query each
+        source_count, enabled_sources = db.query(
+            func.count(Source.id),
+            func.sum(case((Source.enabled == True, 1), else_=0)),
+        ).one()
+        article_count, bookmarked_count, analyzed_count, high_potential = db.query(
+            func.count(Article.id),
+            func.sum(case((Article.bookmarked == True, 1), else_=0)),
+            func.sum(case((Article.illustration_score != None, 1), else_=0)),
+            func.sum(case((Article.illustration_score >= 85, 1), else_=0)),
+        ).one()
 
         # Articles by category
-        from sqlalchemy import func
-
         category_counts = (
             db.query(Source.category, func.count(Article.id))
             .join(Article)
@@ -161,15 +210,12 @@ def cmd_stats(args):
             .all()
         )
 
-        # High potential articles
-        high_potential = db.query(Article).filter(Article.illustration_score >= 85).count()
-
         print("\n=== Sermon Illustrate Stats ===\n")
-        print(f"Sources: {source_count} ({enabled_sources} enabled)")
+        print(f"Sources: {source_count} ({enabled_sources or 0} enabled)")
         print(f"Articles: {article_count}")
-        print(f"  Analyzed: {analyzed_count}")
-        print(f"  High potential (85+): {high_potential}")
-        print(f"  Bookmarked: {bookmarked_count}")
+        print(f"  Analyzed: {analyzed_count or 0}")
+        print(f"  High potential (85+): {high_potential or 0}")
+        print(f"  Bookmarked: {bookmarked_count or 0}")
 
         if category_counts:
             print(f"\nArticles by category:")
@@ -182,6 +228,8 @@ def cmd_stats(args):
 def cmd_analyze(args):
     """Analyze articles for sermon illustration potential."""
     import os
+    from src.processors.analyzer import analyze_batch
+    from src.processors.article_index import get_article_index, unindexed_count
 
     # Check for API key
     api_key = args.api_key or os.getenv("ANTHROPIC_API_KEY")
@@ -210,6 +258,12 @@ def cmd_analyze(args):
                 print(f"  [{art['score']:3}] {art['title']}")
                 print(f"        Themes: {themes}")
 
+        index = get_article_index()
+        missing = unindexed_count(db, index) if index.enabled else 0
+        if missing:
+            print(f"\nSearch index is missing {missing} analyzed articles;")
+            print("run 'reindex' so search can use it.")
+
     finally:
         db.close()
 
@@ -222,32 +276,70 @@ def cmd_top(args):
             db.query(Article)
             .filter(Article.illustration_score != None)
             .order_by(Article.illustration_score.desc())
+            # selectinload, not joinedload: themes is many-to-many and a join
+            # would repeat each article row once per theme
+            .options(selectinload(Article.themes).load_only(Theme.name))
         )
 
         if args.category:
-            query = query.join(Source).filter(Source.category == args.category)
+            query = query.filter(Article.category == args.category)
 
         if args.min_score:
             query = query.filter(Article.illustration_score >= args.min_score)
 
-        articles = query.limit(args.limit).all()
+        shown = 0
+        for article in query.limit(args.limit).yield_per(CLI_BATCH_SIZE):
+            if not shown:
+                print("\n" + _TOP_ROW(score="Score", title="Title", themes="Themes"))
+                print("-" * 90)
+            shown += 1
 
-        if not articles:
+            themes = ", ".join([t.name for t in article.themes[:3]]) if article.themes else "-"
+            print(
+                _TOP_ROW(
+                    score=int(article.illustration_score),
+                    title=_trunc(article.title, 55),
+                    themes=_trunc(themes, 23),
+                )
+            )
+
+        if not shown:
             print("No analyzed articles found. Run 'analyze' first.")
             return
 
-        print(f"\n{'Score':<6} {'Title':<55} {'Themes':<25}")
-        print("-" * 90)
+        print(f"\nShowing {shown} articles")
+    finally:
+        db.close()
+
 
-        for article in articles:
-            title = article.title[:53] + ".." if len(article.title) > 55 else article.title
-            themes = ", ".join([t.name for t in article.themes[:3]]) if article.themes else "-"
-            if len(themes) > 23:
-                themes = themes[:21] + ".."
-            score = int(article.illustration_score)
-            print(f"{score:<6} {title:<55} {themes:<25}")
+def cmd_reindex(args):
+    """Rebuild the search index from all analyzed articles."""
+    from src.processors.article_index import get_article_index, index_text
+
+    index = get_article_index()
+    if not index.enabled:
+        print("Search index disabled: install sentence-transformers and faiss-cpu.")
+        return
+
+    db = SessionLocal()
+    try:
+        query = (
+            select(Article)
+            .where(Article.analyzed_at != None)
+            .options(load_only(Article.id, Article.title, Article.ai_summary), lazyload(Article.themes))
+            .execution_options(yield_per=REINDEX_BATCH_SIZE)
+        )
 
-        print(f"\nShowing {len(articles)} articles")
+        def batches():
+            indexed = 0
+            for batch in db.scalars(query).partitions():
+                yield [article.id for article in batch], [index_text(article) for article in batch]
+                indexed += len(batch)
+                print(f"Indexed {indexed} articles...")
+
+        # Built from scratch, so articles deleted since are dropped
+        index.rebuild(batches())
+        print(f"\nSearch index holds {len(index)} articles")
     finally:
         db.close()
 
@@ -294,6 +386,9 @@ def main():
     top_parser.add_argument("-m", "--min-score", type=int, default=0, help="Minimum score")
     top_parser.add_argument("-l", "--limit", type=int, default=20, help="Number of articles")
 
+    # reindex
+    reindex_parser = subparsers.add_parser("reindex", help="Rebuild the search index of analyzed articles")
+
     args = parser.parse_args()
 
     if args.command == "init":
@@ -312,6 +407,8 @@ def main():
         cmd_analyze(args)
     elif args.command == "top":
         cmd_top(args)
+    elif args.command == "reindex":
+        cmd_reindex(args)
     else:
         parser.print_help()
 
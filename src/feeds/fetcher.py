@@ -3,12 +3,19 @@
 import asyncio
 import httpx
 from datetime import datetime
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import AsyncIterator, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session, lazyload
 
 from src.feeds.parser import parse_feed, ParsedArticle
 from src.storage.models import Source, Article
 
+# Entries published longer ago than this are not stored
+MAX_ARTICLE_AGE_DAYS = 30
+
+# Returned in place of feed content when the server answers 304 Not Modified
+NOT_MODIFIED = object()
+
 
 class FeedFetcher:
     """Async service for fetching RSS feeds."""
@@ -21,28 +28,64 @@ class FeedFetcher:
             max_concurrent: Maximum concurrent feed fetches
         """
         self.timeout = timeout
+        self.max_concurrent = max_concurrent
         self.semaphore = asyncio.Semaphore(max_concurrent)
         self.headers = {
             "User-Agent": "SermonIllustrate/1.0 (RSS Reader; +https://github.com/pastormiles/sermon_illustrate)"
         }
-
-    async def fetch_feed(self, url: str) -> tuple[Optional[str], Optional[str]]:
-        """Fetch a single feed URL.
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "FeedFetcher":
+        """Open one pooled HTTP client shared by every fetch."""
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            follow_redirects=True,
+            http2=True,
+            headers=self.headers,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrent * 4,
+                max_keepalive_connections=self.max_concurrent,
+            ),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Close the shared HTTP client."""
+        await self._client.aclose()
+        self._client = None
+
+    async def fetch_feed(self, source: Source) -> tuple[Optional[bytes], Optional[str]]:
+        """Fetch a source's feed, skipping the download if it hasn't changed.
+
+        Sends the source's stored ETag/Last-Modified as a conditional GET and
+        records the new validators on the source after a full response.
 
         Args:
-            url: Feed URL to fetch
+            source: Source model instance
 
         Returns:
-            Tuple of (content, error_message)
+            Tuple of (raw body bytes, error_message). The content is
+            NOT_MODIFIED when the server answered 304.
         """
+        if self._client is None:
+            raise RuntimeError("FeedFetcher must be used as an async context manager")
+
+        url = source.url
+        headers = {}
+        if source.etag:
+            headers["If-None-Match"] = source.etag
+        if source.last_modified:
+            headers["If-Modified-Since"] = source.last_modified
+
         async with self.semaphore:
             try:
-                async with httpx.AsyncClient(
-                    timeout=self.timeout, follow_redirects=True
-                ) as client:
-                    response = await client.get(url, headers=self.headers)
-                    response.raise_for_status()
-                    return response.text, None
+                response = await self._client.get(url, headers=headers)
+                if response.status_code == 304:
+                    return NOT_MODIFIED, None
+                response.raise_for_status()
+                source.etag = response.headers.get("ETag")
+                source.last_modified = response.headers.get("Last-Modified")
+                return response.content, None
             except httpx.TimeoutException:
                 return None, f"Timeout fetching {url}"
             except httpx.HTTPStatusError as e:
@@ -50,37 +93,47 @@ class FeedFetcher:
             except Exception as e:
                 return None, f"Error fetching {url}: {str(e)}"
 
-    async def fetch_and_parse(self, source: Source) -> tuple[list[ParsedArticle], Optional[str]]:
+    async def fetch_and_parse(
+        self, source: Source
+    ) -> tuple[Optional[list[ParsedArticle]], Optional[str]]:
         """Fetch and parse a feed source.
 
         Args:
             source: Source model instance
 
         Returns:
-            Tuple of (articles, error_message)
+            Tuple of (articles, error_message). Articles is None when the
+            feed is unchanged since the last fetch.
         """
-        content, error = await self.fetch_feed(source.url)
+        content, error = await self.fetch_feed(source)
 
         if error:
             return [], error
 
+        if content is NOT_MODIFIED:
+            return None, None
+
         try:
-            articles = parse_feed(content)
+            # Parsing is CPU-bound; run it off the event loop so other fetches proceed
+            articles = await asyncio.to_thread(parse_feed, content, MAX_ARTICLE_AGE_DAYS)
             return articles, None
         except Exception as e:
+            # Forget the validators so the next fetch downloads the feed again
+            source.etag = None
+            source.last_modified = None
             return [], f"Error parsing feed: {str(e)}"
 
     async def fetch_all_sources(
         self, db: Session, enabled_only: bool = True
-    ) -> dict[int, tuple[list[ParsedArticle], Optional[str]]]:
-        """Fetch all sources from database.
+    ) -> AsyncIterator[tuple[Source, Optional[list[ParsedArticle]], Optional[str]]]:
+        """Fetch all sources from database, yielding each as soon as it finishes.
 
         Args:
             db: Database session
             enabled_only: Only fetch enabled sources
 
-        Returns:
-            Dict mapping source_id to (articles, error)
+        Yields:
+            (source, articles, error) tuples in completion order
         """
         query = db.query(Source)
         if enabled_only:
@@ -88,21 +141,27 @@ class FeedFetcher:
 
         sources = query.all()
 
-        # Create tasks for all sources
-        tasks = [self.fetch_and_parse(source) for source in sources]
+        async def fetch_source(source: Source):
+            articles, error = await self.fetch_and_parse(source)
+            return source, articles, error
 
-        # Fetch all concurrently
-        results = await asyncio.gather(*tasks)
-
-        # Map results to source IDs
-        return {source.id: result for source, result in zip(sources, results)}
+        # Start every fetch now; the semaphore in fetch_feed bounds concurrency
+        tasks = [asyncio.create_task(fetch_source(source)) for source in sources]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Don't leave fetches running if the consumer stops early
+            for task in tasks:
+                task.cancel()
 
 
 def save_articles(
     db: Session,
     source: Source,
     parsed_articles: list[ParsedArticle],
-    max_age_days: int = 30,
+    max_age_days: int = MAX_ARTICLE_AGE_DAYS,
+    commit: bool = True,
 ) -> tuple[int, int]:
     """Save parsed articles to database.
 
@@ -111,14 +170,27 @@ def save_articles(
         source: Source the articles came from
         parsed_articles: List of parsed articles
         max_age_days: Skip articles older than this
+        commit: Commit when done; pass False to only flush and let the
+            caller commit several sources in one transaction
 
     Returns:
         Tuple of (new_count, updated_count)
     """
-    new_count = 0
+    new_articles: list[Article] = []
     updated_count = 0
     cutoff = datetime.utcnow().replace(hour=0, minute=0, second=0)
 
+    # Look up every already-stored URL in one query. The IN list is an
+    # expanding parameter, so the compiled SQL is cached across calls.
+    # Themes aren't touched here, so they skip their usual eager load
+    urls = [parsed.url for parsed in parsed_articles]
+    existing_by_url = {
+        article.url: article
+        for article in db.scalars(
+            select(Article).where(Article.url.in_(urls)).options(lazyload(Article.themes))
+        )
+    }
+
     for parsed in parsed_articles:
         # Skip very old articles
         if parsed.published_at:
@@ -127,33 +199,41 @@ def save_articles(
                 continue
 
         # Check if article already exists
-        existing = db.query(Article).filter(Article.url == parsed.url).first()
+        existing = existing_by_url.get(parsed.url)
 
         if existing:
             # Update if we have new content
-            if parsed.content and not existing.content:
-                existing.content = parsed.content
+            if parsed.clean_content and not existing.content:
+                existing.content = parsed.clean_content
                 updated_count += 1
         else:
             # Create new article
             article = Article(
                 source_id=source.id,
+                source_name=source.name,
+                category=source.category,
                 title=parsed.title,
                 url=parsed.url,
-                summary=parsed.summary,
-                content=parsed.content,
+                summary=parsed.clean_summary,
+                content=parsed.clean_content,
                 author=parsed.author,
                 published_at=parsed.published_at,
             )
-            db.add(article)
-            new_count += 1
+            new_articles.append(article)
+            existing_by_url[parsed.url] = article
+
+    # Insert all new articles in one batch
+    db.add_all(new_articles)
 
     # Update source last_fetched
     source.last_fetched = datetime.utcnow()
     source.fetch_error = None
 
-    db.commit()
-    return new_count, updated_count
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return len(new_articles), updated_count
 
 
 async def refresh_feeds(db: Session) -> dict:
@@ -165,30 +245,35 @@ async def refresh_feeds(db: Session) -> dict:
     Returns:
         Summary of fetch results
     """
-    fetcher = FeedFetcher()
-    results = await fetcher.fetch_all_sources(db)
-
     summary = {
         "sources_fetched": 0,
         "sources_failed": 0,
+        "sources_not_modified": 0,
         "articles_new": 0,
         "articles_updated": 0,
         "errors": [],
     }
 
-    for source_id, (articles, error) in results.items():
-        source = db.query(Source).get(source_id)
-
-        if error:
-            source.fetch_error = error
-            source.last_fetched = datetime.utcnow()
-            db.commit()
-            summary["sources_failed"] += 1
-            summary["errors"].append({"source": source.name, "error": error})
-        else:
-            new_count, updated_count = save_articles(db, source, articles)
-            summary["sources_fetched"] += 1
-            summary["articles_new"] += new_count
-            summary["articles_updated"] += updated_count
-
+    # Save each source as it arrives while the slower feeds are still downloading
+    async with FeedFetcher() as fetcher:
+        async for source, articles, error in fetcher.fetch_all_sources(db):
+            if error:
+                source.fetch_error = error
+                source.last_fetched = datetime.utcnow()
+                summary["sources_failed"] += 1
+                summary["errors"].append({"source": source.name, "error": error})
+            elif articles is None:
+                # 304 Not Modified: nothing to parse or save
+                source.last_fetched = datetime.utcnow()
+                source.fetch_error = None
+                summary["sources_fetched"] += 1
+                summary["sources_not_modified"] += 1
+            else:
+                new_count, updated_count = save_articles(db, source, articles, commit=False)
+                summary["sources_fetched"] += 1
+                summary["articles_new"] += new_count
+                summary["articles_updated"] += updated_count
+
+    # One commit for the whole refresh
+    db.commit()
     return summary
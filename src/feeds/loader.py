@@ -23,32 +23,35 @@ def load_sources_from_yaml(db: Session, config_path: Path = None) -> tuple[int,
     with open(config_path) as f:
         config = yaml.safe_load(f)
 
-    added = 0
-    skipped = 0
+    source_configs = [s for s in config.get("sources", []) if s.get("url")]
 
-    for source_config in config.get("sources", []):
-        url = source_config.get("url")
-        if not url:
-            continue
+    # Look up every configured URL in one query
+    urls = [s["url"] for s in source_configs]
+    existing_urls = {url for (url,) in db.query(Source.url).filter(Source.url.in_(urls))}
+
+    new_sources = []
+    skipped = 0
 
-        # Check if source already exists
-        existing = db.query(Source).filter(Source.url == url).first()
-        if existing:
+    for source_config in source_configs:
+        url = source_config["url"]
+        if url in existing_urls:
             skipped += 1
             continue
 
         # Create new source
-        source = Source(
-            name=source_config.get("name", "Unknown"),
-            url=url,
-            category=source_config.get("category", "general"),
-            enabled=source_config.get("enabled", True),
+        new_sources.append(
+            Source(
+                name=source_config.get("name", "Unknown"),
+                url=url,
+                category=source_config.get("category", "general"),
+                enabled=source_config.get("enabled", True),
+            )
         )
-        db.add(source)
-        added += 1
+        existing_urls.add(url)
 
+    db.add_all(new_sources)
     db.commit()
-    return added, skipped
+    return len(new_sources), skipped
 
 
 def seed_themes(db: Session) -> int:
@@ -60,17 +63,17 @@ def seed_themes(db: Session) -> int:
     Returns:
         Number of themes added
     """
-    added = 0
-
-    for name, description in DEFAULT_THEMES:
-        existing = db.query(Theme).filter(Theme.name == name).first()
-        if not existing:
-            theme = Theme(name=name, description=description)
-            db.add(theme)
-            added += 1
-
+    names = [name for name, _ in DEFAULT_THEMES]
+    existing = {name for (name,) in db.query(Theme.name).filter(Theme.name.in_(names))}
+
+    new_themes = [
+        Theme(name=name, description=description)
+        for name, description in DEFAULT_THEMES
+        if name not in existing
+    ]
+    db.add_all(new_themes)
     db.commit()
-    return added
+    return len(new_themes)
 
 
 def init_data(db: Session) -> dict:
@@ -1,15 +1,34 @@
 """RSS/Atom feed parser."""
 
-import feedparser
+import html
+import io
+import re
+from calendar import timegm
 from datetime import datetime
-from time import mktime
+from functools import cached_property
 from typing import Optional
 from dataclasses import dataclass
 
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # selectolax is optional; fall back to the regex stripper
+    HTMLParser = None
+
+# Below this length the regex path beats the cost of building a parse tree
+HTML_PARSER_MIN_LENGTH = 200
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+
 
 @dataclass
 class ParsedArticle:
-    """Parsed article from a feed."""
+    """Parsed article from a feed.
+
+    summary and content hold the raw feed HTML; use clean_summary and
+    clean_content for plain text. Stripping happens on first access, so
+    entries that are never saved are never stripped.
+    """
 
     title: str
     url: str
@@ -18,43 +37,57 @@ class ParsedArticle:
     author: Optional[str] = None
     published_at: Optional[datetime] = None
 
-    def __post_init__(self):
-        # Clean up summary - remove HTML tags for plain text
-        if self.summary:
-            self.summary = self._strip_html(self.summary)
-        if self.content:
-            self.content = self._strip_html(self.content)
+    @cached_property
+    def clean_summary(self) -> Optional[str]:
+        """Summary with HTML tags removed."""
+        return self._strip_html(self.summary) if self.summary else self.summary
+
+    @cached_property
+    def clean_content(self) -> Optional[str]:
+        """Content with HTML tags removed."""
+        return self._strip_html(self.content) if self.content else self.content
 
     @staticmethod
     def _strip_html(text: str) -> str:
         """Remove HTML tags from text."""
-        import re
-
-        # Remove HTML tags
-        clean = re.sub(r"<[^>]+>", "", text)
-        # Decode HTML entities
-        clean = clean.replace("&nbsp;", " ")
-        clean = clean.replace("&amp;", "&")
-        clean = clean.replace("&lt;", "<")
-        clean = clean.replace("&gt;", ">")
-        clean = clean.replace("&quot;", '"')
-        clean = clean.replace("&#39;", "'")
+        if HTMLParser is not None and len(text) >= HTML_PARSER_MIN_LENGTH:
+            # Parse long HTML in C; drops script/style bodies and decodes entities
+            tree = HTMLParser(text)
+            tree.strip_tags(["script", "style"])
+            plain = tree.text(separator=" ") if tree.root else ""
+        else:
+            # Remove HTML tags, decode HTML entities
+            plain = html.unescape(_TAG_RE.sub("", text))
+
         # Normalize whitespace
-        clean = re.sub(r"\s+", " ", clean).strip()
-        return clean
+        return _WS_RE.sub(" ", plain).strip()
 
 
-def parse_feed(feed_content: str) -> list[ParsedArticle]:
+def _to_dt(parsed_time) -> Optional[datetime]:
+    """Convert a feedparser UTC struct_time to a naive UTC datetime."""
+    try:
+        return datetime.utcfromtimestamp(timegm(parsed_time))
+    except (ValueError, OverflowError):
+        return None
+
+
+def parse_feed(feed_content: bytes, max_age_days: Optional[int] = None) -> list[ParsedArticle]:
     """Parse RSS/Atom feed content into articles.
 
     Args:
-        feed_content: Raw XML content of the feed
+        feed_content: Raw XML bytes of the feed, as received over HTTP
+        max_age_days: Skip entries published more than this many days ago
 
     Returns:
         List of ParsedArticle objects
     """
-    parsed = feedparser.parse(feed_content)
+    # Imported here so commands that never parse feeds don't pay for it
+    import feedparser
+
+    # Hand feedparser the undecoded bytes; it sniffs the encoding itself
+    parsed = feedparser.parse(io.BytesIO(feed_content))
     articles = []
+    now = datetime.utcnow()
 
     for entry in parsed.entries:
         # Get the article URL
@@ -83,15 +116,13 @@ def parse_feed(feed_content: str) -> list[ParsedArticle]:
         # Get published date
         published_at = None
         if "published_parsed" in entry and entry.published_parsed:
-            try:
-                published_at = datetime.fromtimestamp(mktime(entry.published_parsed))
-            except (ValueError, OverflowError):
-                pass
+            published_at = _to_dt(entry.published_parsed)
         elif "updated_parsed" in entry and entry.updated_parsed:
-            try:
-                published_at = datetime.fromtimestamp(mktime(entry.updated_parsed))
-            except (ValueError, OverflowError):
-                pass
+            published_at = _to_dt(entry.updated_parsed)
+
+        # Drop old entries before building (and later stripping) them
+        if max_age_days is not None and published_at and (now - published_at).days > max_age_days:
+            continue
 
         articles.append(
             ParsedArticle(
@@ -107,16 +138,18 @@ def parse_feed(feed_content: str) -> list[ParsedArticle]:
     return articles
 
 
-def get_feed_info(feed_content: str) -> dict:
+def get_feed_info(feed_content: bytes) -> dict:
     """Get metadata about a feed.
 
     Args:
-        feed_content: Raw XML content of the feed
+        feed_content: Raw XML bytes of the feed
 
     Returns:
         Dictionary with feed metadata
     """
-    parsed = feedparser.parse(feed_content)
+    import feedparser
+
+    parsed = feedparser.parse(io.BytesIO(feed_content))
     feed = parsed.feed
 
     return {
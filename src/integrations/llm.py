@@ -0,0 +1,107 @@
+"""Shared Anthropic and OpenAI clients."""
+
+import os
+from functools import lru_cache
+from typing import Optional
+
+from anthropic import Anthropic, AsyncAnthropic
+
+try:
+    from openai import AsyncOpenAI, OpenAI
+except ImportError:  # OpenAI is optional; Anthropic is used without it
+    AsyncOpenAI = OpenAI = None
+
+
+@lru_cache(maxsize=1)
+def get_anthropic_key() -> Optional[str]:
+    """Get the Anthropic API key from the environment (read once)."""
+    return os.getenv("ANTHROPIC_API_KEY")
+
+
+@lru_cache(maxsize=1)
+def get_openai_key() -> Optional[str]:
+    """Get the OpenAI API key from the environment (read once).
+
+    Returns None when the openai package isn't installed.
+    """
+    if OpenAI is None:
+        return None
+    return os.getenv("OPENAI_API_KEY")
+
+
+@lru_cache(maxsize=None)
+def anthropic_client(api_key: str) -> Anthropic:
+    """Get the shared Anthropic client for an API key.
+
+    Clients hold an HTTP connection pool, so one is created per key and
+    reused for the life of the process.
+    """
+    return Anthropic(api_key=api_key)
+
+
+@lru_cache(maxsize=None)
+def openai_client(api_key: str) -> OpenAI:
+    """Get the shared OpenAI client for an API key."""
+    return OpenAI(api_key=api_key)
+
+
+@lru_cache(maxsize=None)
+def async_anthropic_client(api_key: str) -> AsyncAnthropic:
+    """Get the shared async Anthropic client for an API key."""
+    return AsyncAnthropic(api_key=api_key)
+
+
+@lru_cache(maxsize=None)
+def async_openai_client(api_key: str) -> AsyncOpenAI:
+    """Get the shared async OpenAI client for an API key."""
+    return AsyncOpenAI(api_key=api_key)
+
+
+def cached_prompt(preamble: str, body: str) -> list[dict]:
+    """Build user message content with a prompt-cached static preamble.
+
+    The preamble is marked for Anthropic's prompt cache, so requests that
+    share it within a few minutes skip reprocessing it. Preambles shorter
+    than the model's minimum cacheable length are simply sent uncached.
+
+    Args:
+        preamble: Instructions that are the same on every request
+        body: The per-request part of the prompt
+
+    Returns:
+        Content blocks for a "user" message
+    """
+    return [
+        {"type": "text", "text": preamble, "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": body},
+    ]
+
+
+def tool_input(response) -> dict:
+    """Get the input of the tool call in a Claude response.
+
+    Raises:
+        ValueError: If the response has no tool call
+    """
+    for block in response.content:
+        if block.type == "tool_use":
+            return block.input
+    raise ValueError("Response has no tool call")
+
+
+def get_openai_client() -> Optional[OpenAI]:
+    """Get the shared OpenAI client, or None if no key is configured."""
+    api_key = get_openai_key()
+    return openai_client(api_key) if api_key else None
+
+
+def get_async_anthropic_client() -> Optional[AsyncAnthropic]:
+    """Get the shared async Anthropic client, or None if no key is configured."""
+    api_key = get_anthropic_key()
+    return async_anthropic_client(api_key) if api_key else None
+
+
+def get_async_openai_client() -> Optional[AsyncOpenAI]:
+    """Get the shared async OpenAI client, or None if no key is configured."""
+    api_key = get_openai_key()
+    return async_openai_client(api_key) if api_key else None
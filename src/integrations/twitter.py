@@ -1,10 +1,21 @@
 """Twitter/X integration for trending topics and search."""
 
 import os
-import tweepy
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Optional
 from dataclasses import dataclass
 
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from src.storage.models import OAuthState, OAuthToken
+
+if TYPE_CHECKING:
+    import tweepy
+
+# How long a started authorization can wait for its callback
+OAUTH_STATE_TTL = timedelta(minutes=10)
+
 
 @dataclass
 class TrendingTopic:
@@ -38,8 +49,11 @@ def get_twitter_config() -> Optional[TwitterConfig]:
     )
 
 
-def get_oauth2_handler(config: TwitterConfig) -> tweepy.OAuth2UserHandler:
+def get_oauth2_handler(config: TwitterConfig) -> "tweepy.OAuth2UserHandler":
     """Create OAuth2 handler for user authentication."""
+    # tweepy is heavy to import; only load it once Twitter is actually used
+    import tweepy
+
     return tweepy.OAuth2UserHandler(
         client_id=config.client_id,
         client_secret=config.client_secret,
@@ -48,12 +62,14 @@ def get_oauth2_handler(config: TwitterConfig) -> tweepy.OAuth2UserHandler:
     )
 
 
-def get_client_from_token(access_token: str) -> tweepy.Client:
+def get_client_from_token(access_token: str) -> "tweepy.Client":
     """Create a Twitter client from an access token."""
+    import tweepy
+
     return tweepy.Client(bearer_token=access_token)
 
 
-def get_trending_topics(client: tweepy.Client, woeid: int = 23424977) -> list[TrendingTopic]:
+def get_trending_topics(client: "tweepy.Client", woeid: int = 23424977) -> list[TrendingTopic]:
     """
     Get trending topics for a location.
 
@@ -74,7 +90,7 @@ def get_trending_topics(client: tweepy.Client, woeid: int = 23424977) -> list[Tr
     return []
 
 
-def search_tweets(client: tweepy.Client, query: str, max_results: int = 10) -> list[dict]:
+def search_tweets(client: "tweepy.Client", query: str, max_results: int = 10) -> list[dict]:
     """
     Search for recent tweets matching a query.
 
@@ -123,14 +139,14 @@ def search_tweets(client: tweepy.Client, query: str, max_results: int = 10) -> l
 
 
 class TwitterAuth:
-    """Manages Twitter OAuth2 authentication state."""
+    """Manages Twitter OAuth2 authentication state.
 
-    # In-memory storage for OAuth state (in production, use database)
-    _oauth_states: dict = {}
-    _user_tokens: dict = {}  # user_id -> {access_token, refresh_token}
+    Pending authorizations and tokens live in the database, so the callback
+    can be handled by any worker process.
+    """
 
     @classmethod
-    def start_auth(cls, config: TwitterConfig) -> tuple[str, str]:
+    def start_auth(cls, db: Session, config: TwitterConfig) -> tuple[str, str]:
         """
         Start OAuth flow.
 
@@ -145,23 +161,34 @@ class TwitterAuth:
         parsed = urlparse(auth_url)
         state = parse_qs(parsed.query).get("state", [""])[0]
 
-        # Store handler for callback
-        cls._oauth_states[state] = handler
+        # Keep only the PKCE verifier; the handler is rebuilt for the callback
+        db.execute(delete(OAuthState).where(OAuthState.created_at < datetime.utcnow() - OAUTH_STATE_TTL))
+        db.add(OAuthState(state=state, code_verifier=handler._client.code_verifier))
+        db.commit()
 
         return auth_url, state
 
     @classmethod
-    def complete_auth(cls, state: str, code: str) -> Optional[dict]:
+    def complete_auth(cls, db: Session, config: TwitterConfig, state: str, code: str) -> Optional[dict]:
         """
         Complete OAuth flow with callback code.
 
         Returns:
             Token dict with access_token, refresh_token, etc.
         """
-        handler = cls._oauth_states.pop(state, None)
-        if not handler:
+        pending = db.get(OAuthState, state)
+        if not pending:
+            return None
+
+        db.delete(pending)
+        db.commit()
+
+        if pending.created_at < datetime.utcnow() - OAUTH_STATE_TTL:
             return None
 
+        handler = get_oauth2_handler(config)
+        handler._client.code_verifier = pending.code_verifier
+
         try:
             token = handler.fetch_token(code)
             return token
@@ -170,16 +197,19 @@ class TwitterAuth:
             return None
 
     @classmethod
-    def store_token(cls, user_id: str, token: dict):
+    def store_token(cls, db: Session, user_id: str, token: dict):
         """Store user's Twitter token."""
-        cls._user_tokens[user_id] = token
+        db.merge(OAuthToken(user_id=user_id, token=dict(token)))
+        db.commit()
 
     @classmethod
-    def get_token(cls, user_id: str) -> Optional[dict]:
+    def get_token(cls, db: Session, user_id: str) -> Optional[dict]:
         """Get user's Twitter token."""
-        return cls._user_tokens.get(user_id)
+        stored = db.get(OAuthToken, user_id)
+        return stored.token if stored else None
 
     @classmethod
-    def remove_token(cls, user_id: str):
+    def remove_token(cls, db: Session, user_id: str):
         """Remove user's Twitter token."""
-        cls._user_tokens.pop(user_id, None)
+        db.execute(delete(OAuthToken).where(OAuthToken.user_id == user_id))
+        db.commit()
@@ -1,5 +1,6 @@
 """Sermon Illustrate - Main application entry point."""
 
+import os
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -12,4 +13,16 @@ from src.api.app import create_app
 app = create_app()
 
 if __name__ == "__main__":
-    uvicorn.run("src.main:app", host="0.0.0.0", port=8000, reload=True)
+    if os.getenv("ENV", "development").lower() == "production":
+        # One worker per core with uvloop and httptools (from uvicorn[standard])
+        uvicorn.run(
+            "src.main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=False,
+            workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+            loop="uvloop",
+            http="httptools",
+        )
+    else:
+        uvicorn.run("src.main:app", host="0.0.0.0", port=8000, reload=True)
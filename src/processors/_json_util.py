@@ -0,0 +1,32 @@
+"""Parsing JSON out of LLM responses."""
+
+import json
+import re
+
+import orjson
+
+# A leading ```json / ``` fence and its closing ```
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.S)
+
+
+def parse_llm_json(text: str) -> dict:
+    """Parse the JSON object in an LLM response.
+
+    Markdown code fences are stripped first. If the text still isn't valid
+    JSON, anything around the outermost braces (a preamble or a trailing
+    remark) is dropped and the rest is parsed again.
+
+    Args:
+        text: Response text
+
+    Returns:
+        The parsed object
+
+    Raises:
+        json.JSONDecodeError: If no JSON object can be parsed
+    """
+    text = _FENCE_RE.sub("", text.strip())
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text[text.find("{"):text.rfind("}") + 1])
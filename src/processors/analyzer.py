@@ -1,15 +1,25 @@
 """AI-powered article analyzer for sermon illustration potential."""
 
-import os
-import json
+import asyncio
+import re
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 from dataclasses import dataclass
 
-from anthropic import Anthropic
-from sqlalchemy.orm import Session
+from anthropic import AsyncAnthropic
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session, lazyload
 
-from src.storage.models import Article, Theme
+from src.storage.models import Article, Theme, article_themes
+from src.integrations.llm import anthropic_client, cached_prompt, get_anthropic_key, tool_input
+from src.processors.article_index import get_article_index, index_text
+from src.processors.semantic_cache import cache_text, get_semantic_cache
+
+try:
+    import tiktoken
+except ImportError:  # token counting is optional; lengths are estimated without it
+    tiktoken = None
 
 
 @dataclass
@@ -22,44 +32,152 @@ class AnalysisResult:
     explanation: str  # Why this could be a good illustration
 
 
-ANALYSIS_PROMPT = """You are an assistant helping pastors find sermon illustrations from news articles.
+# Articles sent to Claude per batched analysis request
+ANALYSIS_BATCH_SIZE = 8
+
+# Article tokens sent for analysis; news ledes carry most of the signal
+ANALYSIS_CONTENT_TOKENS = 300
+
+# Rough characters per token, used when tiktoken isn't installed
+CHARS_PER_TOKEN = 4
+
+# Response budget for one article, alone or in a batched request
+ANALYSIS_MAX_TOKENS = 200
+ANALYSIS_TOKENS_PER_ARTICLE = 150
+
+# Analysis requests in flight at once
+ANALYSIS_CONCURRENCY = 8
+
+ANALYSIS_CRITERIA = """Judge {subject} by its human interest, moral weight, relatability, hope, and how easily it connects to biblical themes.
+
+Themes: grace, redemption, hope, love, forgiveness, faith, justice, mercy, healing, perseverance, community, service, stewardship, wisdom, transformation, sacrifice, restoration, unity, purpose, provision"""
+
+SCORING_GUIDE = """Score 0-100: 85+ is a powerful story with clear spiritual parallels, under 25 is a poor fit."""
+
+# Static instructions go first so Anthropic's prompt cache can reuse them;
+# only the article text after them changes between requests
+ANALYSIS_PREAMBLE = """You are an assistant helping pastors find sermon illustrations from news articles.
+
+Rate the article below as a sermon illustration.
+
+""" + ANALYSIS_CRITERIA.format(subject="the article") + """
 
-Analyze this article and evaluate its potential as a sermon illustration.
+""" + SCORING_GUIDE + """
 
-Article Title: {title}
+Record your rating with the record_analysis tool."""
+
+ANALYSIS_BODY = """Title: {title}
 Source: {source}
 Category: {category}
 
-Article Content:
-{content}
+{content}"""
+
+BATCH_ANALYSIS_PREAMBLE = """You are an assistant helping pastors find sermon illustrations from news articles.
+
+Rate each article below separately as a sermon illustration. Each starts with its id in square brackets.
+
+""" + ANALYSIS_CRITERIA.format(subject="each article") + """
+
+""" + SCORING_GUIDE + """
+
+Record your ratings with the record_analyses tool, one entry per article."""
 
----
+BATCH_ARTICLE_BLOCK = """[{id}] {title} | {source} | {category}
+{content}"""
 
-Evaluate this article on these criteria:
-1. **Human Interest**: Does it tell a compelling human story?
-2. **Moral/Ethical Dimension**: Does it raise moral questions or demonstrate values?
-3. **Universal Experience**: Does it connect to experiences most people can relate to?
-4. **Redemption/Hope**: Does it show transformation, hope, or overcoming adversity?
-5. **Sermon Applicability**: How easily can this connect to biblical themes?
+# Tools Claude is made to call, so results arrive as schema-checked input
+# rather than JSON text in the reply
+ANALYSIS_PROPERTIES = {
+    "illustration_score": {"type": "integer", "minimum": 0, "maximum": 100},
+    "summary": {"type": "string", "description": "Sermon-relevant summary, max 25 words"},
+    "themes": {"type": "array", "items": {"type": "string"}, "maxItems": 3, "description": "Up to 3 of the listed themes"},
+    "explanation": {"type": "string", "description": "Why it works or not as an illustration, max 15 words"},
+}
 
-Biblical themes to consider: grace, redemption, hope, love, forgiveness, faith, justice, mercy, healing, perseverance, community, service, stewardship, wisdom, transformation, sacrifice, restoration, unity, purpose, provision
+ANALYSIS_TOOL = {
+    "name": "record_analysis",
+    "description": "Record the sermon illustration rating of the article.",
+    "input_schema": {
+        "type": "object",
+        "properties": ANALYSIS_PROPERTIES,
+        "required": list(ANALYSIS_PROPERTIES),
+    },
+}
 
-Respond in this exact JSON format:
-{{
-    "illustration_score": <0-100 integer>,
-    "summary": "<2-3 sentence summary focused on the sermon-relevant aspects>",
-    "themes": ["<theme1>", "<theme2>", "<theme3>"],
-    "explanation": "<1-2 sentences explaining why this would or wouldn't work as an illustration>"
-}}
+BATCH_ANALYSIS_TOOL = {
+    "name": "record_analyses",
+    "description": "Record the sermon illustration rating of each article.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "results": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "article_id": {"type": "integer", "description": "Id from the square brackets"},
+                        **ANALYSIS_PROPERTIES,
+                    },
+                    "required": ["article_id", *ANALYSIS_PROPERTIES],
+                },
+            },
+        },
+        "required": ["results"],
+    },
+}
 
-Scoring guide:
-- 90-100: Exceptional illustration - powerful story with clear spiritual parallels
-- 75-89: Good illustration - solid story that can connect to biblical themes
-- 50-74: Moderate potential - useful with some creativity
-- 25-49: Limited potential - mostly factual, hard to connect
-- 0-24: Poor fit - technical, controversial, or inappropriate for sermons
 
-Only return the JSON, no other text."""
+_WS_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1)
+def _tokenizer():
+    """Get the tiktoken encoding (loaded on first use)."""
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def truncate_to_tokens(text: str, n_tokens: int) -> str:
+    """Cut text to about n_tokens, ending on a whole word.
+
+    Tokens are counted with tiktoken when it is installed (close to, not
+    exactly, Claude's tokenizer) and estimated from the length otherwise.
+
+    Args:
+        text: Plain text
+        n_tokens: Token budget
+
+    Returns:
+        The text with whitespace collapsed, plus "..." if it was cut
+    """
+    text = _WS_RE.sub(" ", text).strip()
+    if tiktoken is not None:
+        # Article text is data, so strings like <|endoftext|> are plain text
+        token_ids = _tokenizer().encode(text, disallowed_special=())
+        if len(token_ids) <= n_tokens:
+            return text
+        cut = _tokenizer().decode(token_ids[:n_tokens])
+    else:
+        if len(text) <= n_tokens * CHARS_PER_TOKEN:
+            return text
+        cut = text[:n_tokens * CHARS_PER_TOKEN]
+    return cut.rsplit(" ", 1)[0] + "..."
+
+
+def _article_text(article: Article, max_tokens: int) -> str:
+    """Get the text to analyze for an article, truncated to max_tokens."""
+    # Use summary or content, prefer content if available
+    content = article.content or article.summary or article.title
+    return truncate_to_tokens(content, max_tokens)
+
+
+def _to_result(result: dict) -> AnalysisResult:
+    """Build an AnalysisResult from one tool-call result."""
+    return AnalysisResult(
+        illustration_score=int(result.get("illustration_score", 50)),
+        summary=result.get("summary", ""),
+        themes=result.get("themes", []),
+        explanation=result.get("explanation", ""),
+    )
 
 
 class ArticleAnalyzer:
@@ -71,93 +189,263 @@ class ArticleAnalyzer:
         Args:
             api_key: Anthropic API key (defaults to ANTHROPIC_API_KEY env var)
         """
-        self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+        self.api_key = api_key or get_anthropic_key()
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY not set")
 
-        self.client = Anthropic(api_key=self.api_key)
+        self.client = anthropic_client(self.api_key)
+        self.cache = get_semantic_cache()
+        self._theme_map: Optional[dict[str, Theme]] = None
 
-    def analyze_article(self, article: Article) -> AnalysisResult:
-        """Analyze a single article.
+    def theme_map(self, db: Session) -> dict[str, Theme]:
+        """Get themes by name, loaded once per analyzer.
 
         Args:
-            article: Article model instance
+            db: Database session
 
         Returns:
-            AnalysisResult with score, summary, themes, explanation
+            Dict of theme name -> Theme
         """
-        # Use summary or content, prefer content if available
-        content = article.content or article.summary or article.title
+        if self._theme_map is None:
+            self._theme_map = {theme.name: theme for theme in db.scalars(select(Theme))}
+        return self._theme_map
+
+    def cached_analyses(
+        self, db: Session, articles: list[Article]
+    ) -> tuple[dict[int, AnalysisResult], dict]:
+        """Look articles up in the semantic cache.
 
-        # Truncate if too long (keep under ~2000 chars for efficiency)
-        if len(content) > 2000:
-            content = content[:2000] + "..."
+        A hit reuses the saved analysis of the near-duplicate article.
+
+        Args:
+            db: Database session
+            articles: Articles about to be analyzed
+
+        Returns:
+            Tuple of (cached results by article id, embeddings of the
+            misses by article id, for remember())
+        """
+        if not self.cache.enabled or not articles:
+            return {}, {}
+
+        vectors = self.cache.embed(
+            [cache_text(article.title, article.content or article.summary) for article in articles]
+        )
+        matches = self.cache.lookup(vectors)
+
+        # Entries can outlive their article, so only analyzed articles count
+        match_ids = {match for match in matches if match is not None}
+        analyzed = {
+            article.id: article
+            for article in db.scalars(
+                select(Article).where(Article.id.in_(match_ids), Article.analyzed_at != None)
+            )
+        } if match_ids else {}
+
+        hits, misses = {}, {}
+        for article, vector, match in zip(articles, vectors, matches):
+            original = analyzed.get(match)
+            if original is None or original.id == article.id:
+                misses[article.id] = vector
+            else:
+                hits[article.id] = AnalysisResult(
+                    illustration_score=int(original.illustration_score or 0),
+                    summary=original.ai_summary or "",
+                    themes=[theme.name for theme in original.themes],
+                    explanation="",
+                )
+        return hits, misses
+
+    def remember(self, vectors: dict, results: dict[int, Optional[AnalysisResult]]):
+        """Add freshly analyzed articles to the semantic cache.
+
+        Args:
+            vectors: Embeddings returned by cached_analyses()
+            results: Dict of article id -> AnalysisResult (None if it failed)
+        """
+        ids = [article_id for article_id in vectors if results.get(article_id) is not None]
+        self.cache.add(ids, [vectors[i] for i in ids])
 
-        prompt = ANALYSIS_PROMPT.format(
+    def _single_request(self, article: Article) -> dict:
+        """Build the messages.create arguments for one article."""
+        content = _article_text(article, ANALYSIS_CONTENT_TOKENS)
+
+        body = ANALYSIS_BODY.format(
             title=article.title,
             source=article.source_name or "Unknown",
             category=article.category or "general",
             content=content,
         )
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=500,
-            messages=[{"role": "user", "content": prompt}],
-        )
+        return {
+            "model": "claude-sonnet-4-20250514",
+            "max_tokens": ANALYSIS_MAX_TOKENS,
+            "tools": [ANALYSIS_TOOL],
+            "tool_choice": {"type": "tool", "name": ANALYSIS_TOOL["name"]},
+            "messages": [{"role": "user", "content": cached_prompt(ANALYSIS_PREAMBLE, body)}],
+        }
+
+    def _batch_request(self, articles: list[Article]) -> dict:
+        """Build the messages.create arguments for a batch of articles."""
+        blocks = [
+            BATCH_ARTICLE_BLOCK.format(
+                id=article.id,
+                title=article.title,
+                source=article.source_name or "Unknown",
+                category=article.category or "general",
+                content=_article_text(article, ANALYSIS_CONTENT_TOKENS),
+            )
+            for article in articles
+        ]
+        body = "\n\n".join(blocks)
+
+        return {
+            "model": "claude-sonnet-4-20250514",
+            "max_tokens": ANALYSIS_TOKENS_PER_ARTICLE * len(articles),
+            "tools": [BATCH_ANALYSIS_TOOL],
+            "tool_choice": {"type": "tool", "name": BATCH_ANALYSIS_TOOL["name"]},
+            "messages": [{"role": "user", "content": cached_prompt(BATCH_ANALYSIS_PREAMBLE, body)}],
+        }
+
+    @staticmethod
+    def _batch_results(response, articles: list[Article]) -> dict[int, AnalysisResult]:
+        """Map a batch response's results back to the requested article ids."""
+        requested_ids = {article.id for article in articles}
+        results = {}
+        for result in tool_input(response).get("results", []):
+            try:
+                article_id = int(result.get("article_id"))
+            except (TypeError, ValueError):
+                continue
+            if article_id in requested_ids:
+                results[article_id] = _to_result(result)
+        return results
 
-        # Parse JSON response
-        response_text = response.content[0].text.strip()
+    def analyze_article(self, article: Article) -> AnalysisResult:
+        """Analyze a single article.
 
-        # Handle potential markdown code blocks
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-            response_text = response_text.strip()
+        Args:
+            article: Article model instance
 
-        result = json.loads(response_text)
+        Returns:
+            AnalysisResult with score, summary, themes, explanation
+        """
+        response = self.client.messages.create(**self._single_request(article))
+        return _to_result(tool_input(response))
 
-        return AnalysisResult(
-            illustration_score=int(result.get("illustration_score", 50)),
-            summary=result.get("summary", ""),
-            themes=result.get("themes", []),
-            explanation=result.get("explanation", ""),
-        )
+    def analyze_articles(self, articles: list[Article]) -> dict[int, AnalysisResult]:
+        """Analyze several articles in a single request.
+
+        Args:
+            articles: Article model instances (up to ANALYSIS_BATCH_SIZE)
+
+        Returns:
+            Dict of article id -> AnalysisResult. Articles the model left
+            out of its response are missing from the dict.
+        """
+        response = self.client.messages.create(**self._batch_request(articles))
+        return self._batch_results(response, articles)
+
+    async def analyze_article_async(self, client: AsyncAnthropic, article: Article) -> AnalysisResult:
+        """Analyze a single article without blocking the event loop."""
+        response = await client.messages.create(**self._single_request(article))
+        return _to_result(tool_input(response))
+
+    async def analyze_articles_async(
+        self, client: AsyncAnthropic, articles: list[Article]
+    ) -> dict[int, AnalysisResult]:
+        """Analyze a batch of articles without blocking the event loop."""
+        response = await client.messages.create(**self._batch_request(articles))
+        return self._batch_results(response, articles)
+
+
+async def _analyze_concurrently(
+    analyzer: ArticleAnalyzer, articles: list[Article]
+) -> dict[int, Optional[AnalysisResult]]:
+    """Run batched analysis requests concurrently, then retry misses one by one.
+
+    Returns:
+        Dict of article id -> AnalysisResult, or None if analysis failed
+    """
+    semaphore = asyncio.Semaphore(ANALYSIS_CONCURRENCY)
+    results: dict[int, Optional[AnalysisResult]] = {}
+
+    # A fresh client per run: its connection pool belongs to this event loop
+    async with AsyncAnthropic(api_key=analyzer.api_key) as client:
+
+        async def run_batch(batch: list[Article]) -> dict[int, AnalysisResult]:
+            async with semaphore:
+                try:
+                    return await analyzer.analyze_articles_async(client, batch)
+                except Exception as e:
+                    print(f"Batch analysis failed, analyzing one at a time: {e}")
+                    return {}
+
+        async def run_single(article: Article) -> tuple[int, Optional[AnalysisResult]]:
+            async with semaphore:
+                try:
+                    return article.id, await analyzer.analyze_article_async(client, article)
+                except Exception as e:
+                    print(f"Error analyzing article {article.id}: {e}")
+                    return article.id, None
+
+        batches = [
+            articles[start:start + ANALYSIS_BATCH_SIZE]
+            for start in range(0, len(articles), ANALYSIS_BATCH_SIZE)
+        ]
+        for batch_results in await asyncio.gather(*(run_batch(batch) for batch in batches)):
+            results.update(batch_results)
+
+        # Fall back to single-article requests for anything the batches missed
+        missing = [article for article in articles if article.id not in results]
+        for article_id, result in await asyncio.gather(*(run_single(a) for a in missing)):
+            results[article_id] = result
+
+    return results
 
 
-def analyze_and_save(db: Session, article: Article, analyzer: ArticleAnalyzer) -> bool:
-    """Analyze an article and save results to database.
+def save_analysis(article: Article, result: AnalysisResult, themes: dict[str, Theme]) -> list[Theme]:
+    """Copy an analysis result onto an article (the caller commits).
+
+    Theme links are written separately with link_themes().
 
     Args:
-        db: Database session
-        article: Article to analyze
-        analyzer: ArticleAnalyzer instance
+        article: Article that was analyzed
+        result: Its AnalysisResult
+        themes: Dict of theme name -> Theme, from ArticleAnalyzer.theme_map()
 
     Returns:
-        True if successful, False otherwise
+        The known themes named in the result
     """
-    try:
-        result = analyzer.analyze_article(article)
+    article.illustration_score = result.illustration_score
+    article.ai_summary = result.summary
+    article.analyzed_at = datetime.utcnow()
 
-        # Update article
-        article.illustration_score = result.illustration_score
-        article.ai_summary = result.summary
-        article.analyzed_at = datetime.utcnow()
+    matched = (themes.get(theme_name.lower()) for theme_name in result.themes)
+    return list(dict.fromkeys(theme for theme in matched if theme))
 
-        # Link themes
-        article.themes = []
-        for theme_name in result.themes:
-            theme = db.query(Theme).filter(Theme.name == theme_name.lower()).first()
-            if theme:
-                article.themes.append(theme)
 
-        db.commit()
-        return True
+def link_themes(db: Session, article_themes_by_id: dict[int, list[Theme]]):
+    """Replace the theme links of analyzed articles (the caller commits).
 
-    except Exception as e:
-        print(f"Error analyzing article {article.id}: {e}")
-        return False
+    Old links go in one DELETE and new ones in one multi-row INSERT,
+    rather than a statement per link through the relationship.
+
+    Args:
+        db: Database session
+        article_themes_by_id: Dict of article id -> its themes
+    """
+    if not article_themes_by_id:
+        return
+
+    db.execute(delete(article_themes).where(article_themes.c.article_id.in_(article_themes_by_id)))
+    rows = [
+        {"article_id": article_id, "theme_id": theme.id}
+        for article_id, themes in article_themes_by_id.items()
+        for theme in themes
+    ]
+    if rows:
+        db.execute(insert(article_themes), rows)
 
 
 def analyze_batch(
@@ -177,9 +465,11 @@ def analyze_batch(
     Returns:
         Summary of analysis results
     """
-    # Find unanalyzed articles with sufficient content
+    # Find unanalyzed articles with sufficient content. link_themes() writes
+    # their themes directly, so the relationship is never loaded
     articles = (
         db.query(Article)
+        .options(lazyload(Article.themes))
         .filter(Article.analyzed_at == None)
         .filter(
             (Article.content != None) | (Article.summary != None)
@@ -192,7 +482,9 @@ def analyze_batch(
     if not articles:
         return {"analyzed": 0, "skipped": 0, "errors": 0, "message": "No articles to analyze"}
 
+    # A fresh analyzer per batch, so themes added since the last batch are seen
     analyzer = ArticleAnalyzer(api_key=api_key)
+    themes = analyzer.theme_map(db)
 
     results = {
         "analyzed": 0,
@@ -202,26 +494,58 @@ def analyze_batch(
         "articles": [],
     }
 
+    # Check content length
+    to_analyze = []
     for article in articles:
-        # Check content length
         content = article.content or article.summary or ""
         if len(content) < min_content_length:
             results["skipped"] += 1
-            continue
-
-        success = analyze_and_save(db, article, analyzer)
-
-        if success:
-            results["analyzed"] += 1
-            if article.illustration_score and article.illustration_score >= 85:
-                results["high_potential"] += 1
-            results["articles"].append({
-                "id": article.id,
-                "title": article.title[:50] + "..." if len(article.title) > 50 else article.title,
-                "score": article.illustration_score,
-                "themes": [t.name for t in article.themes],
-            })
         else:
+            to_analyze.append(article)
+
+    # Near-duplicates of already-analyzed articles reuse the cached analysis.
+    # The cache is an optimization, so if it fails everything is analyzed
+    try:
+        cached, vectors = analyzer.cached_analyses(db, to_analyze)
+    except Exception as e:
+        print(f"Semantic cache unavailable, analyzing every article: {e}")
+        cached, vectors = {}, {}
+    pending = [article for article in to_analyze if article.id not in cached]
+
+    # All requests run concurrently; results are saved afterwards in one commit
+    analyses = asyncio.run(_analyze_concurrently(analyzer, pending)) if pending else {}
+    analyses.update(cached)
+
+    links = {}
+    for article in to_analyze:
+        result = analyses.get(article.id)
+        if result is None:
             results["errors"] += 1
+            continue
+
+        links[article.id] = save_analysis(article, result, themes)
+        results["analyzed"] += 1
+        if article.illustration_score and article.illustration_score >= 85:
+            results["high_potential"] += 1
+        results["articles"].append({
+            "id": article.id,
+            "title": article.title[:50] + "..." if len(article.title) > 50 else article.title,
+            "score": article.illustration_score,
+            "themes": [t.name for t in links[article.id]],
+        })
+
+    link_themes(db, links)
+    # Read before the commit expires the articles' loaded fields
+    index_ids = [article.id for article in to_analyze if article.id in links]
+    index_texts = [index_text(article) for article in to_analyze if article.id in links]
+    db.commit()
+
+    # The analyses are saved either way; `reindex` rebuilds a search index
+    # that missed them
+    try:
+        analyzer.remember(vectors, analyses)
+        get_article_index().add(index_ids, index_texts)
+    except Exception as e:
+        print(f"Error updating the search index: {e}")
 
     return results
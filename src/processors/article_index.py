@@ -0,0 +1,165 @@
+"""Vector index of analyzed articles for search.
+
+Each analyzed article is embedded once, from its title and AI summary, and
+stored in a FAISS index under its id. A search query is then matched by a
+nearest-neighbor lookup instead of a Claude ranking request.
+
+Search uses the index only once it covers every analyzed article, so
+articles analyzed before it existed need a `python -m src.cli reindex`.
+
+Needs the optional sentence-transformers and faiss-cpu packages; without
+them the index is disabled and search ranks candidates with Claude.
+"""
+
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.processors.embeddings import EMBEDDING_DIM, embed, faiss, np, write_index
+from src.storage.database import DATABASE_PATH
+from src.storage.models import Article
+
+INDEX_PATH = DATABASE_PATH.parent / "article_index.faiss"
+
+ANALYZED_COUNT_STMT = select(func.count()).select_from(Article).where(Article.analyzed_at != None)
+
+
+def index_text(article: Article) -> str:
+    """Text embedded for an article: its title and AI summary."""
+    return f"{article.title}\n{article.ai_summary or ''}"
+
+
+class ArticleIndex:
+    """FAISS index of article embeddings keyed by article id."""
+
+    def __init__(self, index_path: Path = INDEX_PATH):
+        """Initialize the index. It loads on first use.
+
+        Args:
+            index_path: Where the FAISS index is persisted
+        """
+        self.enabled = faiss is not None
+        self.index_path = index_path
+        self._index = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Load the persisted index, again if another process rewrote it."""
+        mtime = self.index_path.stat().st_mtime if self.index_path.exists() else None
+        if self._index is not None and mtime == self._mtime:
+            return
+
+        self._index = faiss.read_index(str(self.index_path)) if mtime is not None else _empty_index()
+        self._mtime = mtime
+
+    def __len__(self) -> int:
+        """Number of indexed articles (0 when the index is disabled)."""
+        if not self.enabled:
+            return 0
+
+        with self._lock:
+            self._load()
+            return self._index.ntotal
+
+    def add(self, article_ids: list[int], texts: list[str]):
+        """Index articles, replacing earlier entries, and persist the index.
+
+        Args:
+            article_ids: Ids of the articles
+            texts: Their index_text(), in the same order
+        """
+        if not self.enabled or not article_ids:
+            return
+
+        vectors = embed(texts)
+        ids = np.array(article_ids, dtype="int64")
+
+        with self._lock:
+            self._load()
+            self._index.remove_ids(ids)
+            self._index.add_with_ids(vectors, ids)
+            self._save()
+
+    def rebuild(self, batches: Iterable[tuple[list[int], list[str]]]) -> int:
+        """Replace the whole index, dropping entries of deleted articles.
+
+        The new index is built in memory and swapped in at the end, so
+        searches keep using the old one meanwhile.
+
+        Args:
+            batches: (article ids, their index_text()) pairs
+
+        Returns:
+            Number of indexed articles
+        """
+        if not self.enabled:
+            return 0
+
+        index = _empty_index()
+        for article_ids, texts in batches:
+            if article_ids:
+                index.add_with_ids(embed(texts), np.array(article_ids, dtype="int64"))
+
+        with self._lock:
+            self._index = index
+            self._save()
+            return index.ntotal
+
+    def _save(self):
+        """Persist the index (the caller holds the lock)."""
+        write_index(self._index, self.index_path)
+        self._mtime = self.index_path.stat().st_mtime
+
+    def search(self, query: str, k: int, ids: Optional[list[int]] = None) -> list[tuple[int, float]]:
+        """Find the articles nearest to a query.
+
+        Args:
+            query: Search text
+            k: Maximum number of articles
+            ids: Only consider these article ids (all if None)
+
+        Returns:
+            List of (article id, cosine similarity), most similar first
+        """
+        if not self.enabled or (ids is not None and not ids):
+            return []
+
+        params = None
+        if ids is not None:
+            selector = faiss.IDSelectorBatch(np.array(ids, dtype="int64"))
+            params = faiss.SearchParameters(sel=selector)
+
+        vector = embed([query])
+        with self._lock:
+            self._load()
+            if self._index.ntotal == 0:
+                return []
+            scores, found = self._index.search(vector, k, params=params)
+
+        return [
+            (int(article_id), float(score))
+            for score, article_id in zip(scores[0], found[0])
+            if article_id >= 0
+        ]
+
+
+def _empty_index() -> "faiss.Index":
+    """Create an empty index keyed by article id."""
+    # Inner product on normalized vectors is cosine similarity
+    return faiss.IndexIDMap2(faiss.IndexFlatIP(EMBEDDING_DIM))
+
+
+def unindexed_count(db: Session, index: "ArticleIndex") -> int:
+    """Number of analyzed articles missing from the index (0 if it covers them all)."""
+    return max(db.scalar(ANALYZED_COUNT_STMT) - len(index), 0)
+
+
+@lru_cache(maxsize=1)
+def get_article_index() -> ArticleIndex:
+    """Get the process-wide article index."""
+    return ArticleIndex()
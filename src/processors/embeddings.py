@@ -0,0 +1,49 @@
+"""Local text embeddings for the semantic cache and the article index.
+
+Needs the optional sentence-transformers and faiss-cpu packages; without
+them `faiss` is None here and everything built on embeddings is disabled.
+"""
+
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import faiss
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # embeddings are optional
+    faiss = np = SentenceTransformer = None
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_DIM = 384
+
+_model_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def get_embedding_model() -> "SentenceTransformer":
+    """Get the process-wide embedding model (loaded on first use)."""
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+
+def embed(texts: list[str]) -> "np.ndarray":
+    """Embed texts as L2-normalized float32 vectors.
+
+    Inner products of these vectors are cosine similarities.
+    """
+    with _model_lock:
+        vectors = get_embedding_model().encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+    return np.asarray(vectors, dtype="float32")
+
+
+def write_index(index: "faiss.Index", path: Path):
+    """Persist a FAISS index atomically.
+
+    The index is written to a temporary file and renamed over the old one,
+    so another process never reads a half-written index.
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    faiss.write_index(index, str(tmp_path))
+    os.replace(tmp_path, path)
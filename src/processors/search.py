@@ -1,16 +1,22 @@
 """Sermon-focused search for finding relevant illustrations."""
 
-import os
-import json
+import re
+import threading
+from datetime import datetime
+from itertools import islice
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
-from openai import OpenAI
-from anthropic import Anthropic
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+import orjson
+from cachetools import LRUCache
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import bindparam, case, func, or_, select
 
-from src.storage.models import Article, Theme, Source
+from src.storage.models import Article, Theme, DEFAULT_THEMES, article_themes
+from src.integrations.llm import anthropic_client, cached_prompt, get_anthropic_key, get_openai_client, tool_input
+from src.processors._json_util import parse_llm_json
+from src.processors.article_index import ArticleIndex, get_article_index, unindexed_count
+from src.storage.query_cache import get_cached, query_key, set_cached
 
 
 @dataclass
@@ -48,26 +54,118 @@ Respond in JSON format:
 Only return JSON, no other text."""
 
 
-RELEVANCE_RANKING_PROMPT = """You are helping a pastor find sermon illustrations.
+# Word stems that signal each theme in a search query (matched at word starts)
+THEME_KEYWORDS = {
+    "grace": ("grace", "gracious", "unmerited", "favor", "favour"),
+    "redemption": ("redeem", "redemp", "rescue", "salvation", "ransom"),
+    "hope": ("hope", "hoping", "optimis", "despair"),
+    "love": ("love", "loving", "agape", "charity"),
+    "forgiveness": ("forgiv", "forgave", "pardon"),
+    "faith": ("faith", "trust", "belie", "doubt"),
+    "justice": ("justice", "injustice", "fairness", "righteous", "oppress"),
+    "mercy": ("mercy", "merciful", "compassion", "kindness"),
+    "healing": ("heal", "cure", "recover", "illness", "sickness"),
+    "perseverance": ("persever", "endur", "steadfast", "resilien", "persist", "trials"),
+    "community": ("communit", "fellowship", "togetherness", "neighbo", "belonging"),
+    "service": ("serve", "service", "servant", "serving", "volunteer", "humble", "humility"),
+    "stewardship": ("steward", "generosit", "generous", "tithe"),
+    "wisdom": ("wisdom", "wise", "discern", "insight"),
+    "transformation": ("transform", "renew", "born again", "new creation"),
+    "sacrifice": ("sacrific", "selfless"),
+    "restoration": ("restor", "rebuild", "reconcil"),
+    "unity": ("unity", "unite", "division", "divided", "harmony"),
+    "purpose": ("purpose", "calling", "meaning", "vocation"),
+    "provision": ("provision", "provide", "provider", "daily bread"),
+}
+
+# One compiled matcher per theme, in DEFAULT_THEMES order
+THEME_PATTERNS = tuple(
+    (name, re.compile(r"\b(?:" + "|".join(map(re.escape, THEME_KEYWORDS[name])) + r")", re.IGNORECASE))
+    for name, _ in DEFAULT_THEMES
+)
+
+# Queries matching this many themes by keyword skip the LLM
+MIN_KEYWORD_THEMES = 2
+
+# Candidate articles sent to the relevance ranking
+SEARCH_CANDIDATES = 20
+
+# Nearest articles taken from the vector index per result wanted, leaving
+# room for the illustration score to reorder them (see hybrid_score)
+VECTOR_SEARCH_OVERFETCH = 3
+
+# Vector search hits are ordered by a blend of the article's illustration
+# score and its similarity to the query, weighted by this share
+ILLUSTRATION_SCORE_WEIGHT = 0.6
+
+# Top vector search results whose connection is written by Claude
+CONNECTION_RESULTS = 5
+
+# LLM query analyses, keyed by a hash of the normalized query
+query_analysis_cache = LRUCache(maxsize=256)
+query_analysis_lock = threading.Lock()
+
+
+def match_query_themes(query: str) -> list[str]:
+    """Find the default themes a query mentions by keyword."""
+    return [name for name, pattern in THEME_PATTERNS if pattern.search(query)]
+
+
+def iter_result_objects(chunks: Iterable[str]) -> Iterator[dict]:
+    """Yield each object of a streamed {"results": [...]} response as soon as it closes.
 
-Sermon Topic: {query}
+    Args:
+        chunks: Text fragments of the response, in order
 
-Analyze these articles and rank them by how well they could illustrate the sermon topic.
+    Yields:
+        Parsed result dicts
+    """
+    in_array = False
+    depth = 0
+    in_string = False
+    escaped = False
+    current: list[str] = []
+
+    for chunk in chunks:
+        for ch in chunk:
+            if not in_array:
+                # Skip everything (code fences, the outer object) up to the array
+                in_array = ch == "["
+                continue
+
+            if depth == 0:
+                if ch == "{":
+                    depth = 1
+                    current = [ch]
+                elif ch == "]":
+                    return
+                continue
+
+            current.append(ch)
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    yield orjson.loads("".join(current))
+
+
+# Static instructions go first so Anthropic's prompt cache can reuse them
+RELEVANCE_RANKING_PREAMBLE = """You are helping a pastor find sermon illustrations.
+
+Analyze the articles below and rank them by how well they could illustrate the sermon topic.
 For each relevant article, explain the connection to the sermon.
 
-Articles:
-{articles}
-
-Return a JSON array of the top matches (most relevant first), maximum 10 results:
-{{
-    "results": [
-        {{
-            "article_id": <id>,
-            "relevance_score": <0-100>,
-            "connection": "<1-2 sentences explaining how this story illustrates the sermon topic>"
-        }}
-    ]
-}}
+Record the top matches (most relevant first), maximum 10 results, with the record_rankings tool.
 
 Scoring guide:
 - 90-100: Perfect illustration - directly demonstrates the biblical principle
@@ -75,7 +173,68 @@ Scoring guide:
 - 50-69: Moderate fit - usable with some creativity
 - Below 50: Weak connection - skip these
 
-Only include articles scoring 50+. Only return JSON, no other text."""
+Only include articles scoring 50+."""
+
+RELEVANCE_RANKING_BODY = """Sermon Topic: {query}
+
+Articles:
+{articles}"""
+
+CONNECTION_PREAMBLE = """You are helping a pastor find sermon illustrations.
+
+For each article below, write 1-2 sentences explaining how the story could illustrate the sermon topic.
+
+Record them with the record_connections tool."""
+
+CONNECTION_TOOL = {
+    "name": "record_connections",
+    "description": "Record how each article could illustrate the sermon topic.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "results": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "article_id": {"type": "integer"},
+                        "connection": {"type": "string"},
+                    },
+                    "required": ["article_id", "connection"],
+                },
+            },
+        },
+        "required": ["results"],
+    },
+}
+
+# Claude is made to call these tools, so results arrive as schema-checked input
+RELEVANCE_RANKING_TOOL = {
+    "name": "record_rankings",
+    "description": "Record the articles that illustrate the sermon topic, most relevant first.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "results": {
+                "type": "array",
+                "maxItems": 10,
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "article_id": {"type": "integer"},
+                        "relevance_score": {"type": "integer", "minimum": 0, "maximum": 100},
+                        "connection": {
+                            "type": "string",
+                            "description": "1-2 sentences explaining how this story illustrates the sermon topic",
+                        },
+                    },
+                    "required": ["article_id", "relevance_score", "connection"],
+                },
+            },
+        },
+        "required": ["results"],
+    },
+}
 
 
 class SermonSearch:
@@ -87,89 +246,208 @@ class SermonSearch:
         Args:
             api_key: Anthropic API key (defaults to ANTHROPIC_API_KEY env var)
         """
-        self.anthropic_key = api_key or os.getenv("ANTHROPIC_API_KEY")
-        self.openai_key = os.getenv("OPENAI_API_KEY")
+        self.anthropic_key = api_key or get_anthropic_key()
 
         if not self.anthropic_key:
             raise ValueError("ANTHROPIC_API_KEY not set")
 
-        self.anthropic = Anthropic(api_key=self.anthropic_key)
-        self.openai = OpenAI(api_key=self.openai_key) if self.openai_key else None
+        self.anthropic = anthropic_client(self.anthropic_key)
+        self.openai = get_openai_client()
 
-    def analyze_query(self, query: str) -> dict:
+    def analyze_query(self, query: str, db: Optional[Session] = None) -> dict:
         """Analyze a sermon query to extract themes and concepts.
 
+        Queries that name enough themes outright are matched by keyword;
+        only the rest go to an LLM. Those answers are cached in memory and,
+        given a session, in the database query cache shared by all workers.
+
         Args:
             query: User's search query (verse, theme, idea)
+            db: Optional database session for the shared cache
 
         Returns:
             Dict with themes, concepts, and sermon_angle
         """
+        themes = match_query_themes(query)
+        if len(themes) >= MIN_KEYWORD_THEMES:
+            return {"themes": themes, "concepts": [], "sermon_angle": ""}
+
+        key = query_key("analysis", query)
+        with query_analysis_lock:
+            cached = query_analysis_cache.get(key)
+        if cached is None and db is not None:
+            cached = get_cached(db, key)
+        if cached is not None:
+            return cached
+
+        analysis = self._analyze_query_llm(query)
+        with query_analysis_lock:
+            query_analysis_cache[key] = analysis
+        if db is not None:
+            set_cached(db, key, analysis)
+            db.commit()
+        return analysis
+
+    def _analyze_query_llm(self, query: str) -> dict:
+        """Ask an LLM for a query's themes and concepts."""
         prompt = QUERY_ANALYSIS_PROMPT.format(query=query)
 
         # Use GPT-4o-mini for fast query analysis (falls back to Haiku)
         if self.openai:
             response = self.openai.chat.completions.create(
                 model="gpt-4o-mini",
-                max_tokens=200,
+                max_tokens=150,
                 messages=[{"role": "user", "content": prompt}],
             )
-            response_text = response.choices[0].message.content.strip()
+            response_text = response.choices[0].message.content
         else:
             response = self.anthropic.messages.create(
                 model="claude-3-5-haiku-20241022",
-                max_tokens=200,
+                max_tokens=150,
                 messages=[{"role": "user", "content": prompt}],
             )
-            response_text = response.content[0].text.strip()
-
-        # Handle markdown code blocks
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-            response_text = response_text.strip()
+            response_text = response.content[0].text
 
-        return json.loads(response_text)
+        return parse_llm_json(response_text)
 
-    def rank_articles(self, query: str, articles: list[Article]) -> list[dict]:
+    def rank_articles(self, query: str, articles: list[Article]) -> Iterator[dict]:
         """Rank articles by relevance to sermon query.
 
+        The tool call is streamed, and each ranking is yielded as soon as
+        its JSON object is complete.
+
         Args:
             query: User's search query
             articles: List of Article objects to rank
 
-        Returns:
-            List of ranking results with relevance scores and connections
+        Yields:
+            Ranking results with relevance scores and connections, most
+            relevant first
         """
-        # Format articles for the prompt (keep summaries short for speed)
-        articles_text = "\n".join([
-            f"[{a.id}] {a.title} | {(a.ai_summary or a.summary or '')[:150]} | Themes: {', '.join([t.name for t in a.themes])}"
-            for a in articles
-        ])
-
-        prompt = RELEVANCE_RANKING_PROMPT.format(
+        body = RELEVANCE_RANKING_BODY.format(
             query=query,
-            articles=articles_text,
+            articles=_articles_text(articles),
         )
 
-        response = self.anthropic.messages.create(
+        with self.anthropic.messages.stream(
             model="claude-sonnet-4-20250514",
             max_tokens=1000,
-            messages=[{"role": "user", "content": prompt}],
+            tools=[RELEVANCE_RANKING_TOOL],
+            tool_choice={"type": "tool", "name": RELEVANCE_RANKING_TOOL["name"]},
+            messages=[{"role": "user", "content": cached_prompt(RELEVANCE_RANKING_PREAMBLE, body)}],
+        ) as stream:
+            yield from iter_result_objects(
+                event.partial_json for event in stream if event.type == "input_json"
+            )
+
+    def explain_connections(self, query: str, articles: list[Article]) -> dict[int, str]:
+        """Explain how each article could illustrate a sermon topic.
+
+        Args:
+            query: User's search query
+            articles: Articles already picked for the query
+
+        Returns:
+            Dict of article id -> connection
+        """
+        body = RELEVANCE_RANKING_BODY.format(
+            query=query,
+            articles=_articles_text(articles),
+        )
+
+        response = self.anthropic.messages.create(
+            model="claude-3-5-haiku-20241022",
+            max_tokens=80 * len(articles),
+            tools=[CONNECTION_TOOL],
+            tool_choice={"type": "tool", "name": CONNECTION_TOOL["name"]},
+            messages=[{"role": "user", "content": cached_prompt(CONNECTION_PREAMBLE, body)}],
+        )
+
+        connections = {}
+        for result in tool_input(response).get("results", []):
+            if isinstance(result.get("article_id"), int):
+                connections[result["article_id"]] = result.get("connection", "")
+        return connections
+
+
+def _articles_text(articles: list[Article]) -> str:
+    """Format articles for a prompt, one line each (summaries kept short for speed)."""
+    return "\n".join([
+        f"[{a.id}] {a.title} | {(a.ai_summary or a.summary or '')[:150]} | Themes: {', '.join([t.name for t in a.themes])}"
+        for a in articles
+    ])
+
+
+def _theme_connection(article: Article, query_themes: set[str]) -> str:
+    """Describe an article by the themes it shares with the query."""
+    themes = [t.name for t in article.themes if t.name in query_themes] or [t.name for t in article.themes][:3]
+    return f"Speaks to {', '.join(themes)}." if themes else ""
+
+
+def _search_result(article: Article, relevance_score: int, connection: str, now: datetime) -> SearchResult:
+    """Build the SearchResult for a ranked article, dated relative to now."""
+    return SearchResult(
+        article_id=article.id,
+        title=article.title,
+        url=article.url,
+        source=article.source_name or "Unknown",
+        category=article.category or "general",
+        summary=article.ai_summary or article.summary or "",
+        illustration_score=int(article.illustration_score or 0),
+        themes=[t.name for t in article.themes],
+        relevance_score=relevance_score,
+        connection=connection,
+        published=article._format_published(now),
+    )
+
+
+def _candidate_stmt(by_category: bool, by_themes: bool):
+    """Build the candidate query: articles with a matching theme first (if
+    any themes), then the top-scoring rest, each by score."""
+    # The ranking prompt and the results read each article's themes
+    stmt = (
+        select(Article)
+        .options(selectinload(Article.themes))
+        .where(Article.illustration_score >= bindparam("min_score"))
+    )
+    if by_category:
+        stmt = stmt.where(Article.category == bindparam("category"))
+
+    order_by = [Article.illustration_score.desc()]
+    if by_themes:
+        has_theme = (
+            select(article_themes.c.article_id)
+            .join(Theme, Theme.id == article_themes.c.theme_id)
+            .where(article_themes.c.article_id == Article.id)
+            .where(Theme.name.in_(bindparam("themes", expanding=True)))
+            .exists()
         )
+        order_by.insert(0, case((has_theme, 0), else_=1))
+
+    return stmt.order_by(*order_by).limit(SEARCH_CANDIDATES)
 
-        response_text = response.content[0].text.strip()
 
-        # Handle markdown code blocks
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-            response_text = response_text.strip()
+def _vector_search_ids_stmt(by_category: bool):
+    """Build the query for the ids of articles a vector search may return."""
+    stmt = select(Article.id).where(Article.illustration_score >= bindparam("min_score"))
+    if by_category:
+        stmt = stmt.where(Article.category == bindparam("category"))
+    return stmt
 
-        result = json.loads(response_text)
-        return result.get("results", [])
+
+# Search statements are built once per shape and run with bound parameters
+CANDIDATE_STMTS = {
+    (by_category, by_themes): _candidate_stmt(by_category, by_themes)
+    for by_category in (False, True)
+    for by_themes in (False, True)
+}
+VECTOR_SEARCH_IDS_STMTS = {by_category: _vector_search_ids_stmt(by_category) for by_category in (False, True)}
+LATEST_ANALYSIS_STMT = select(func.max(Article.analyzed_at))
+ARTICLES_BY_ID_STMT = (
+    select(Article)
+    .options(selectinload(Article.themes))
+    .where(Article.id.in_(bindparam("ids", expanding=True)))
+)
 
 
 def search_illustrations(
@@ -193,85 +471,175 @@ def search_illustrations(
     Returns:
         List of SearchResult objects ranked by relevance
     """
+    return list(
+        iter_search_illustrations(
+            db,
+            query,
+            limit=limit,
+            min_illustration_score=min_illustration_score,
+            api_key=api_key,
+            category=category,
+        )
+    )
+
+
+def iter_search_illustrations(
+    db: Session,
+    query: str,
+    limit: int = 20,
+    min_illustration_score: int = 0,
+    api_key: Optional[str] = None,
+    category: Optional[str] = None,
+) -> Iterator[SearchResult]:
+    """Search for sermon illustrations, yielding each as the ranking streams in.
+
+    Takes the same arguments as search_illustrations.
+
+    Yields:
+        SearchResult objects, most relevant first
+    """
+    # Repeat searches replay the cached ranking until another article is
+    # analyzed, which changes the key
+    latest_analysis = db.scalar(LATEST_ANALYSIS_STMT)
+    key = query_key("results", query, limit, min_illustration_score, category, latest_analysis)
+    cached = get_cached(db, key)
+    if cached is not None:
+        yield from _iter_cached_results(db, cached)
+        return
+
+    # Rank by embedding similarity once every analyzed article is indexed
+    index = get_article_index()
+    if _vector_search_ready(db, index):
+        results = _iter_vector_results(db, index, query, limit, min_illustration_score, api_key, category)
+    else:
+        results = _iter_llm_results(db, query, limit, min_illustration_score, api_key, category)
+
+    ranking = []
+    for result in results:
+        ranking.append({
+            "article_id": result.article_id,
+            "relevance_score": result.relevance_score,
+            "connection": result.connection,
+        })
+        yield result
+
+    # An empty ranking isn't cached, so articles analyzed later are found
+    if ranking:
+        set_cached(db, key, ranking)
+        db.commit()
+
+
+def _vector_search_ready(db: Session, index: ArticleIndex) -> bool:
+    """Whether the article index is usable and covers all analyzed articles."""
+    try:
+        return len(index) > 0 and unindexed_count(db, index) == 0
+    except Exception as e:
+        print(f"Search index unavailable, ranking with Claude: {e}")
+        return False
+
+
+def _iter_cached_results(db: Session, ranking: list[dict]) -> Iterator[SearchResult]:
+    """Rebuild cached results, loading their articles in one query."""
+    articles = db.scalars(ARTICLES_BY_ID_STMT, {"ids": [rank["article_id"] for rank in ranking]})
+    article_map = {a.id: a for a in articles}
+
+    now = datetime.utcnow()
+    for rank in ranking:
+        article = article_map.get(rank["article_id"])
+        if article:
+            yield _search_result(article, rank["relevance_score"], rank["connection"], now)
+
+
+def _iter_llm_results(
+    db: Session,
+    query: str,
+    limit: int,
+    min_illustration_score: int,
+    api_key: Optional[str],
+    category: Optional[str],
+) -> Iterator[SearchResult]:
+    """Search by theme-matched candidates ranked with Claude."""
     search = SermonSearch(api_key=api_key)
 
     # Step 1: Analyze the query to get themes
-    analysis = search.analyze_query(query)
+    analysis = search.analyze_query(query, db)
     query_themes = [t.lower() for t in analysis.get("themes", [])]
 
-    # Step 2: Find candidate articles
-    # First, try to match by theme
-    candidate_articles = []
-
-    if query_themes:
-        # Get articles that have matching themes
-        theme_query = (
-            db.query(Article)
-            .join(Article.themes)
-            .filter(Theme.name.in_(query_themes))
-            .filter(Article.illustration_score >= min_illustration_score)
-        )
-        # Apply category filter if specified
-        if category:
-            theme_query = theme_query.join(Source).filter(Source.category == category)
-        theme_matches = (
-            theme_query
-            .order_by(Article.illustration_score.desc().nullslast())
-            .limit(50)
-            .all()
-        )
-        candidate_articles.extend(theme_matches)
-
-    # Also get top-scoring articles as fallback
-    if len(candidate_articles) < 20:
-        top_query = (
-            db.query(Article)
-            .filter(Article.illustration_score >= min_illustration_score)
-            .filter(Article.illustration_score != None)
-        )
-        # Apply category filter if specified
-        if category:
-            top_query = top_query.join(Source).filter(Source.category == category)
-        top_articles = (
-            top_query
-            .order_by(Article.illustration_score.desc())
-            .limit(30)
-            .all()
-        )
-        # Add articles not already in candidates
-        existing_ids = {a.id for a in candidate_articles}
-        for article in top_articles:
-            if article.id not in existing_ids:
-                candidate_articles.append(article)
+    # Step 2: Find candidate articles in one query: articles with a matching
+    # theme first, then the top-scoring rest as fallback, each by score
+    stmt = CANDIDATE_STMTS[bool(category), bool(query_themes)]
+    params = {"min_score": min_illustration_score, "category": category, "themes": query_themes}
+    candidate_articles = db.scalars(stmt, params).all()
 
     if not candidate_articles:
-        return []
+        return
 
     # Step 3: Rank by relevance using AI (limit to 20 for speed)
-    rankings = search.rank_articles(query, candidate_articles[:20])
+    rankings = search.rank_articles(query, candidate_articles)
 
-    # Step 4: Build results
-    results = []
+    # Step 4: Build results as each ranking arrives
     article_map = {a.id: a for a in candidate_articles}
 
-    for rank in rankings[:limit]:
+    now = datetime.utcnow()
+    for rank in islice(rankings, limit):
         article_id = rank.get("article_id")
         if article_id not in article_map:
             continue
 
         article = article_map[article_id]
-        results.append(SearchResult(
-            article_id=article.id,
-            title=article.title,
-            url=article.url,
-            source=article.source_name or "Unknown",
-            category=article.category or "general",
-            summary=article.ai_summary or article.summary or "",
-            illustration_score=int(article.illustration_score or 0),
-            themes=[t.name for t in article.themes],
-            relevance_score=rank.get("relevance_score", 0),
-            connection=rank.get("connection", ""),
-            published=article._format_published(),
-        ))
-
-    return results
+        yield _search_result(article, rank.get("relevance_score", 0), rank.get("connection", ""), now)
+
+
+def hybrid_score(article: Article, similarity: float) -> float:
+    """Blend an article's illustration score (0-100) with its cosine
+    similarity to the query into one 0-1 ranking score."""
+    quality = (article.illustration_score or 0) / 100
+    return ILLUSTRATION_SCORE_WEIGHT * quality + (1 - ILLUSTRATION_SCORE_WEIGHT) * max(similarity, 0)
+
+
+def _iter_vector_results(
+    db: Session,
+    index: ArticleIndex,
+    query: str,
+    limit: int,
+    min_illustration_score: int,
+    api_key: Optional[str],
+    category: Optional[str],
+) -> Iterator[SearchResult]:
+    """Search by nearest neighbors in the article index.
+
+    The nearest articles that pass the filters are ordered by a blend of
+    illustration score and similarity (see hybrid_score). Relevance is the
+    cosine similarity as a percentage. Claude explains the connection for
+    the top few results; the rest name their shared themes.
+    """
+    # Filter inside the index, so a narrow filter still fills the results
+    params = {"min_score": min_illustration_score, "category": category}
+    eligible_ids = db.scalars(VECTOR_SEARCH_IDS_STMTS[bool(category)], params).all()
+    try:
+        hits = index.search(query, limit * VECTOR_SEARCH_OVERFETCH, ids=eligible_ids)
+    except Exception as e:
+        # e.g. the embedding model can't be downloaded
+        print(f"Vector search failed, ranking with Claude: {e}")
+        yield from _iter_llm_results(db, query, limit, min_illustration_score, api_key, category)
+        return
+    if not hits:
+        return
+
+    articles = db.scalars(ARTICLES_BY_ID_STMT, {"ids": [article_id for article_id, _ in hits]})
+    article_map = {a.id: a for a in articles}
+    ranked = [(article_map[article_id], score) for article_id, score in hits if article_id in article_map]
+    if not ranked:
+        return
+    ranked.sort(key=lambda hit: hybrid_score(hit[0], hit[1]), reverse=True)
+    ranked = ranked[:limit]
+
+    connections = SermonSearch(api_key=api_key).explain_connections(
+        query, [article for article, _ in ranked[:CONNECTION_RESULTS]]
+    )
+    query_themes = set(match_query_themes(query))
+
+    now = datetime.utcnow()
+    for article, score in ranked:
+        connection = connections.get(article.id) or _theme_connection(article, query_themes)
+        yield _search_result(article, round(max(score, 0) * 100), connection, now)
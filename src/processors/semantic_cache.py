@@ -0,0 +1,102 @@
+"""Semantic cache for article analysis results.
+
+Near-duplicate articles (the same story from several outlets) get the
+analysis of the first one instead of another Claude request. Analyzed
+articles are embedded locally and stored in a FAISS index under their id;
+a hit points at the earlier article, whose saved analysis is reused.
+
+Needs the optional sentence-transformers and faiss-cpu packages; without
+them the cache is disabled and every article is analyzed.
+"""
+
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from src.processors.embeddings import EMBEDDING_DIM, embed, faiss, np, write_index
+from src.storage.database import DATABASE_PATH
+
+# Minimum cosine similarity for two articles to share an analysis
+SIMILARITY_THRESHOLD = 0.92
+
+# Characters of article text embedded after the title
+CACHE_TEXT_CHARS = 500
+
+INDEX_PATH = DATABASE_PATH.parent / "semantic_cache_ids.faiss"
+
+
+class SemanticCache:
+    """FAISS index of analyzed-article embeddings keyed by article id."""
+
+    def __init__(self, index_path: Path = INDEX_PATH, threshold: float = SIMILARITY_THRESHOLD):
+        """Initialize the cache. The index loads on first use.
+
+        Args:
+            index_path: Where the FAISS index is persisted
+            threshold: Minimum cosine similarity for a hit
+        """
+        self.enabled = faiss is not None
+        self.index_path = index_path
+        self.threshold = threshold
+        self._index = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Load the persisted index, again if another process rewrote it."""
+        mtime = self.index_path.stat().st_mtime if self.index_path.exists() else None
+        if self._index is not None and mtime == self._mtime:
+            return
+
+        if mtime is not None:
+            self._index = faiss.read_index(str(self.index_path))
+        else:
+            # Inner product on normalized vectors is cosine similarity
+            self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(EMBEDDING_DIM))
+        self._mtime = mtime
+
+    def embed(self, texts: list[str]) -> "np.ndarray":
+        """Embed texts as L2-normalized float32 vectors."""
+        return embed(texts)
+
+    def lookup(self, vectors: "np.ndarray") -> list[Optional[int]]:
+        """Find the analyzed article nearest to each vector.
+
+        Returns:
+            The article id for each vector, or None on a miss
+        """
+        with self._lock:
+            self._load()
+            if self._index.ntotal == 0:
+                return [None] * len(vectors)
+            scores, ids = self._index.search(vectors, 1)
+
+        return [
+            int(article_id) if article_id >= 0 and score >= self.threshold else None
+            for score, article_id in zip(scores[:, 0], ids[:, 0])
+        ]
+
+    def add(self, article_ids: list[int], vectors: list["np.ndarray"]):
+        """Cache analyzed articles under their vectors and persist the index."""
+        if not article_ids:
+            return
+
+        ids = np.array(article_ids, dtype="int64")
+        with self._lock:
+            self._load()
+            self._index.remove_ids(ids)
+            self._index.add_with_ids(np.stack(vectors), ids)
+            write_index(self._index, self.index_path)
+            self._mtime = self.index_path.stat().st_mtime
+
+
+@lru_cache(maxsize=1)
+def get_semantic_cache() -> SemanticCache:
+    """Get the process-wide semantic cache."""
+    return SemanticCache()
+
+
+def cache_text(title: str, body: Optional[str]) -> str:
+    """Text embedded for an article: its title and the start of its body."""
+    return f"{title}\n{(body or '')[:CACHE_TEXT_CHARS]}"
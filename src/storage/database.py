@@ -1,6 +1,7 @@
 """Database connection and session management."""
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.schema import CreateIndex
 from sqlalchemy.orm import sessionmaker, declarative_base
 from pathlib import Path
 
@@ -22,6 +23,42 @@ def get_db():
         db.close()
 
 
+def add_missing_columns(connection):
+    """Add model columns missing from tables created by an older version.
+
+    create_all() only creates missing tables, never columns. Columns added
+    to existing models are nullable, so ADD COLUMN needs no default.
+    """
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=connection.dialect)
+                connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+
+# Indexes of older versions that a newer index now covers
+RETIRED_INDEXES = ("ix_articles_bookmarked",)
+
+
+def add_missing_indexes(connection):
+    """Create model indexes missing from tables created by an older version
+    and drop the indexes they replaced."""
+    for name in RETIRED_INDEXES:
+        connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            connection.execute(CreateIndex(index, if_not_exists=True))
+
+
 def init_db():
-    """Initialize database tables."""
+    """Initialize database tables, bringing an older schema up to date."""
+    # Imported here because the models import Base from this module
+    from src.storage.models import backfill_source_fields
+
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        add_missing_columns(connection)
+        add_missing_indexes(connection)
+        backfill_source_fields(connection)
@@ -1,17 +1,22 @@
 """Database models for Sermon Illustrate."""
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, Table
+from typing import Optional
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, Table, Index, JSON, event, func, select, update
 from sqlalchemy.orm import relationship
 from src.storage.database import Base
 
+# English month abbreviations for published dates (same as %b in the C locale)
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
 
 # Association table for article themes
 article_themes = Table(
     "article_themes",
     Base.metadata,
-    Column("article_id", Integer, ForeignKey("articles.id"), primary_key=True),
-    Column("theme_id", Integer, ForeignKey("themes.id"), primary_key=True),
+    Column("article_id", Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True),
+    Column("theme_id", Integer, ForeignKey("themes.id", ondelete="CASCADE"), primary_key=True),
+    # The primary key covers article -> themes; this covers theme -> articles
+    Index("ix_article_themes_theme", "theme_id", "article_id"),
 )
 
 
@@ -27,9 +32,14 @@ class Source(Base):
     enabled = Column(Boolean, default=True)
     last_fetched = Column(DateTime, nullable=True)
     fetch_error = Column(Text, nullable=True)
+    # Validators from the last successful fetch, sent back for conditional GETs
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    articles = relationship("Article", back_populates="source")
+    # Articles are removed by ON DELETE CASCADE, so deleting a source
+    # never loads its articles into the session
+    articles = relationship("Article", back_populates="source", passive_deletes=True)
 
     def __repr__(self):
         return f"<Source {self.name}>"
@@ -41,7 +51,12 @@ class Article(Base):
     __tablename__ = "articles"
 
     id = Column(Integer, primary_key=True, index=True)
-    source_id = Column(Integer, ForeignKey("sources.id"), nullable=False)
+    source_id = Column(Integer, ForeignKey("sources.id", ondelete="CASCADE"), nullable=False)
+
+    # Copied from the source when the article is stored, so list pages,
+    # search and prompts never need to load the source
+    source_name = Column(String(255), nullable=True)
+    category = Column(String(50), nullable=True, index=True)
 
     # Article content
     title = Column(String(512), nullable=False)
@@ -52,7 +67,7 @@ class Article(Base):
 
     # Metadata
     published_at = Column(DateTime, nullable=True, index=True)
-    fetched_at = Column(DateTime, default=datetime.utcnow)
+    fetched_at = Column(DateTime, default=datetime.utcnow, index=True)
 
     # AI analysis
     illustration_score = Column(Float, nullable=True, index=True)
@@ -60,30 +75,34 @@ class Article(Base):
     analyzed_at = Column(DateTime, nullable=True)
 
     # User interaction
-    bookmarked = Column(Boolean, default=False, index=True)
+    bookmarked = Column(Boolean, default=False)
     notes = Column(Text, nullable=True)
     used_in_sermon = Column(Boolean, default=False)
     sermon_date = Column(DateTime, nullable=True)
 
+    __table_args__ = (
+        # Bookmarks page: bookmarked articles, newest first
+        Index("ix_articles_bookmarked_published", bookmarked, published_at.desc()),
+        # analyze_batch: unanalyzed articles, newest first
+        Index("ix_articles_analyzed_published", analyzed_at, published_at.desc()),
+    )
+
     # Relationships
     source = relationship("Source", back_populates="articles")
-    themes = relationship("Theme", secondary=article_themes, back_populates="articles")
+    # Themes are read wherever articles are shown, so they load with the
+    # articles in one extra SELECT instead of one per article
+    themes = relationship("Theme", secondary=article_themes, back_populates="articles", lazy="selectin")
 
     def __repr__(self):
         return f"<Article {self.title[:50]}>"
 
-    @property
-    def category(self):
-        """Get category from source."""
-        return self.source.category if self.source else None
+    def to_dict(self, now: Optional[datetime] = None):
+        """Convert to dictionary for templates.
 
-    @property
-    def source_name(self):
-        """Get source name."""
-        return self.source.name if self.source else None
-
-    def to_dict(self):
-        """Convert to dictionary for templates."""
+        Args:
+            now: Current UTC time for the relative published date (read
+                from the clock if not given)
+        """
         return {
             "id": self.id,
             "title": self.title,
@@ -91,22 +110,23 @@ class Article(Base):
             "summary": self.summary or self.ai_summary or "",
             "source": self.source_name,
             "category": self.category,
-            "published": self._format_published(),
+            "published": self._format_published(now),
             "illustration_score": self.illustration_score or 0,
             "themes": [t.name for t in self.themes],
             "bookmarked": self.bookmarked,
             "notes": self.notes,
         }
 
-    def _format_published(self):
-        """Format published date as relative time."""
+    def _format_published(self, now: Optional[datetime] = None):
+        """Format published date as relative time to now (default: the clock)."""
         if not self.published_at:
             return "Unknown"
 
-        delta = datetime.utcnow() - self.published_at
+        delta = (now or datetime.utcnow()) - self.published_at
 
         if delta.days > 7:
-            return self.published_at.strftime("%b %d, %Y")
+            published = self.published_at
+            return f"{_MONTHS[published.month - 1]} {published.day:02d}, {published.year}"
         elif delta.days > 0:
             return f"{delta.days} day{'s' if delta.days > 1 else ''} ago"
         elif delta.seconds > 3600:
@@ -119,6 +139,46 @@ class Article(Base):
             return "Just now"
 
 
+def articles_to_dicts(articles: list[Article]) -> list[dict]:
+    """Convert articles for templates, dated against one reading of the clock."""
+    now = datetime.utcnow()
+    return [article.to_dict(now) for article in articles]
+
+
+@event.listens_for(Article, "before_insert")
+def copy_source_fields(mapper, connection, article):
+    """Fill in source_name and category for articles created without them."""
+    if article.source_name is None or article.category is None:
+        name, category = connection.execute(
+            select(Source.name, Source.category).where(Source.id == article.source_id)
+        ).one()
+        if article.source_name is None:
+            article.source_name = name
+        if article.category is None:
+            article.category = category
+
+
+def backfill_source_fields(connection):
+    """Fill in source_name and category on articles stored without them.
+
+    Articles saved before the columns existed have them NULL; this copies
+    them from the source and is a no-op once every article has both.
+    """
+    articles, sources = Article.__table__, Source.__table__
+
+    def from_source(column):
+        return select(column).where(sources.c.id == articles.c.source_id).scalar_subquery()
+
+    connection.execute(
+        update(articles)
+        .where((articles.c.source_name == None) | (articles.c.category == None))
+        .values(
+            source_name=func.coalesce(articles.c.source_name, from_source(sources.c.name)),
+            category=func.coalesce(articles.c.category, from_source(sources.c.category)),
+        )
+    )
+
+
 class Theme(Base):
     """Biblical/sermon theme for categorization."""
 
@@ -134,6 +194,45 @@ class Theme(Base):
         return f"<Theme {self.name}>"
 
 
+class QueryCache(Base):
+    """Cached search work, keyed by a hash of the query and its filters."""
+
+    __tablename__ = "query_cache"
+
+    key = Column(String(32), primary_key=True)
+    value = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<QueryCache {self.key[:8]}>"
+
+
+class OAuthState(Base):
+    """Pending OAuth authorization, keyed by its state parameter."""
+
+    __tablename__ = "oauth_states"
+
+    state = Column(String(128), primary_key=True)
+    code_verifier = Column(String(256), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<OAuthState {self.state[:8]}>"
+
+
+class OAuthToken(Base):
+    """OAuth token issued to a user."""
+
+    __tablename__ = "oauth_tokens"
+
+    user_id = Column(String(64), primary_key=True)
+    token = Column(JSON, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<OAuthToken {self.user_id}>"
+
+
 # Default themes to seed
 DEFAULT_THEMES = [
     ("grace", "God's unmerited favor and forgiveness"),
@@ -0,0 +1,54 @@
+"""Search cache stored in the app database.
+
+Repeat searches reuse the query analysis and the ranked results for an
+hour instead of calling the LLMs again. Living in the database, the cache
+is shared by all workers and survives restarts.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from src.storage.models import QueryCache
+
+QUERY_CACHE_TTL = timedelta(hours=1)
+
+
+def query_key(kind: str, query: str, *params) -> str:
+    """Build a cache key from a normalized query and its parameters.
+
+    Args:
+        kind: What is cached (e.g. "analysis" or "results")
+        query: Search query; case and whitespace don't matter
+        *params: Filters that change the cached value
+
+    Returns:
+        BLAKE2b-128 hex digest
+    """
+    normalized = " ".join(query.lower().split())
+    text = "\x1f".join([kind, normalized, *map(str, params)])
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def get_cached(db: Session, key: str) -> Optional[Any]:
+    """Get a cached value, or None if it is missing or expired."""
+    return db.scalar(
+        select(QueryCache.value)
+        .where(QueryCache.key == key)
+        .where(QueryCache.created_at >= datetime.utcnow() - QUERY_CACHE_TTL)
+    )
+
+
+def set_cached(db: Session, key: str, value: Any):
+    """Store a value and prune expired entries (the caller commits)."""
+    now = datetime.utcnow()
+    db.execute(delete(QueryCache).where(QueryCache.created_at < now - QUERY_CACHE_TTL))
+    db.execute(
+        insert(QueryCache)
+        .values(key=key, value=value, created_at=now)
+        .on_conflict_do_update(index_elements=[QueryCache.key], set_={"value": value, "created_at": now})
+    )
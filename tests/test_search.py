@@ -0,0 +1,69 @@
+"""Tests for the search helpers that run without an LLM."""
+
+from src.processors.search import iter_result_objects, match_query_themes
+
+
+def test_result_objects_split_across_chunks():
+    text = '{"results": [{"article_id": 1, "connection": "a"}, {"article_id": 2, "connection": "b"}]}'
+    chunks = [text[i:i + 3] for i in range(0, len(text), 3)]
+
+    assert list(iter_result_objects(chunks)) == [
+        {"article_id": 1, "connection": "a"},
+        {"article_id": 2, "connection": "b"},
+    ]
+
+
+def test_result_objects_yield_before_stream_ends():
+    chunks = iter(['{"results": [{"article_id": 1}', ", {", '"article_id": 2}]}'])
+    results = iter_result_objects(chunks)
+
+    assert next(results) == {"article_id": 1}
+    assert next(chunks) == ", {"
+
+
+def test_result_objects_escaped_quote():
+    chunks = ['{"results": [{"connection": "he said \\"', 'go\\" and \\\\"}, {"article_id": 3}]}']
+
+    assert list(iter_result_objects(chunks)) == [
+        {"connection": 'he said "go" and \\'},
+        {"article_id": 3},
+    ]
+
+
+def test_result_objects_braces_and_brackets_in_strings():
+    chunks = ['{"results": [{"connection": "a } b { c ] d"}, {"article_id": 4, "x": {"y": [1]}}]}']
+
+    assert list(iter_result_objects(chunks)) == [
+        {"connection": "a } b { c ] d"},
+        {"article_id": 4, "x": {"y": [1]}},
+    ]
+
+
+def test_result_objects_code_fence():
+    chunks = ['```json\n{"results": [', '{"article_id": 5}', "]}\n```"]
+
+    assert list(iter_result_objects(chunks)) == [{"article_id": 5}]
+
+
+def test_result_objects_empty_results():
+    assert list(iter_result_objects(['{"results": []}'])) == []
+
+
+def test_match_query_themes_keywords():
+    themes = match_query_themes("Finding hope and grace when trust breaks")
+
+    assert themes == ["grace", "hope", "faith"]
+
+
+def test_match_query_themes_word_prefixes():
+    assert match_query_themes("Forgiving the unforgivable") == ["forgiveness"]
+    # Keywords match at the start of a word, not inside one
+    assert match_query_themes("disgraceful") == []
+
+
+def test_match_query_themes_case_and_phrases():
+    assert match_query_themes("GIVE US THIS DAY OUR DAILY BREAD") == ["provision"]
+
+
+def test_match_query_themes_no_match():
+    assert match_query_themes("quarterly earnings report") == []